@@ -23,11 +23,34 @@ import asyncio
 import argparse
 import re
 import sys
+from functools import cache, lru_cache
 from pathlib import Path
 
 sys.path.insert(0, "src")
 from PIL import Image, ImageDraw, ImageFont
 from p31s.connection import BLEConnection
+from p31s.tspl import Density, LabelSize, create_print_job
+
+# 14x40mm labels with a 2mm gap
+LABEL_14X40 = LabelSize(width=14, height=40, gap=2)
+
+# All smartctl fields we need as one alternation, so a single finditer
+# pass over a drive block extracts them (named group = field)
+FIELDS_RE = re.compile(
+    r'^(?:Serial [Nn]umber:(?P<serial>.*)'
+    r'|Vendor:(?P<vendor>.*)'
+    r'|Product:(?P<product>.*)'
+    r'|Device Model:(?P<model>.*)'
+    r'|User Capacity:(?P<capacity>.*))',
+    re.MULTILINE,
+)
+# Each drive's output starts with "smartctl X.X"
+BLOCK_SPLIT_RE = re.compile(r'(?=smartctl \d+\.\d+)')
+
+# Seconds between labels when the printer can't tell us it's done
+LABEL_DELAY = 4.0
+# An idle status this soon after sending may predate the print job starting
+MIN_LABEL_DELAY = 1.0
 
 
 def parse_smartctl_text(content: str) -> dict | None:
@@ -35,21 +58,28 @@ def parse_smartctl_text(content: str) -> dict | None:
 
     Handles both SCSI/SAS format (Vendor/Product) and ATA/SATA format (Device Model).
     """
-    vendor = ""
-    product = ""
+    # One pass over the block picks up every field; first occurrence wins
+    fields = {}
+    for match in FIELDS_RE.finditer(content):
+        name = match.lastgroup
+        if name not in fields:
+            fields[name] = match.group(name).strip()
+
+    serial = fields.get('serial')
+    vendor = fields.get('vendor')
+    product = fields.get('product')
+    device_model = fields.get('model')
 
-    # Try SCSI format first (Vendor + Product)
-    vendor_match = re.search(r'^Vendor:\s+(.+)$', content, re.MULTILINE)
-    product_match = re.search(r'^Product:\s+(.+)$', content, re.MULTILINE)
+    # Skip if we didn't find essential info
+    if not serial:
+        return None
 
-    if vendor_match and product_match:
-        vendor = vendor_match.group(1).strip()
-        product = product_match.group(1).strip()
-    else:
-        # Try ATA format (Device Model contains both vendor and model)
-        model_match = re.search(r'^Device Model:\s+(.+)$', content, re.MULTILINE)
-        if model_match:
-            device_model = model_match.group(1).strip()
+    # SCSI format has Vendor + Product; otherwise fall back to ATA format
+    if vendor is None or product is None:
+        vendor = ""
+        product = ""
+        if device_model is not None:
+            # Device Model contains both vendor and model
             # Try to split vendor from model (first word is often vendor)
             parts = device_model.split(None, 1)
             if len(parts) == 2:
@@ -58,26 +88,20 @@ def parse_smartctl_text(content: str) -> dict | None:
             else:
                 product = device_model
 
-    # Extract serial number (case-insensitive for 'number')
-    serial_match = re.search(r'^Serial [Nn]umber:\s+(.+)$', content, re.MULTILINE)
-    serial = serial_match.group(1).strip() if serial_match else ""
-
     # Extract capacity - look for the human-readable format like [8.00 TB]
-    capacity_match = re.search(r'User Capacity:.*\[([^\]]+)\]', content)
-    if capacity_match:
-        capacity = capacity_match.group(1).strip()
+    capacity = ""
+    capacity_line = fields.get('capacity', "")
+    lb = capacity_line.find('[')
+    rb = capacity_line.find(']', lb + 1)
+    if lb >= 0 and rb > lb + 1:
+        capacity = capacity_line[lb + 1:rb].strip()
         # Convert to whole units (e.g., "8.00 TB" -> "8TB")
-        cap_num_match = re.match(r'([\d.]+)\s*(\w+)', capacity)
-        if cap_num_match:
-            num = float(cap_num_match.group(1))
-            unit = cap_num_match.group(2)
-            capacity = f"{int(num)}{unit}"
-    else:
-        capacity = ""
-
-    # Skip if we didn't find essential info
-    if not serial:
-        return None
+        num_end = 0
+        while num_end < len(capacity) and capacity[num_end] in '0123456789.':
+            num_end += 1
+        unit = capacity[num_end:].strip()
+        if num_end and unit:
+            capacity = f"{int(float(capacity[:num_end]))}{unit}"
 
     return {
         'vendor': vendor,
@@ -95,8 +119,7 @@ def parse_smartctl_file(filepath: Path) -> list[dict]:
     content = filepath.read_text()
 
     # Split on smartctl header to handle concatenated files
-    # Each drive's output starts with "smartctl X.X"
-    blocks = re.split(r'(?=smartctl \d+\.\d+)', content)
+    blocks = BLOCK_SPLIT_RE.split(content)
 
     drives = []
     for block in blocks:
@@ -110,8 +133,12 @@ def parse_smartctl_file(filepath: Path) -> list[dict]:
     return drives
 
 
+@cache
 def load_font(size: int, bold: bool = False):
-    """Load a font with fallbacks for different platforms."""
+    """Load a font with fallbacks for different platforms.
+
+    Cached per (size, bold) so a batch of labels parses each font once.
+    """
     if bold:
         fonts = ['/System/Library/Fonts/Helvetica.ttc',
                  '/System/Library/Fonts/SFCompact.ttf',
@@ -130,6 +157,16 @@ def load_font(size: int, bold: bool = False):
     return ImageFont.load_default()
 
 
+# Scratch surface for text measurement; textbbox only lays the text out
+_MEASURE_DRAW = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+
+
+@lru_cache(maxsize=512)
+def text_bbox(text: str, size: int, bold: bool = False) -> tuple[int, int, int, int]:
+    """Measure text at the origin, cached since vendors and products repeat in a batch."""
+    return _MEASURE_DRAW.textbbox((0, 0), text, font=load_font(size, bold))
+
+
 def create_label_image(drive_info: dict) -> Image.Image:
     """Create a label image for a drive."""
     width, height = 320, 120
@@ -152,7 +189,7 @@ def create_label_image(drive_info: dict) -> Image.Image:
     top_section_height = pad_top + 42
     h_line_y = top_section_height + 3
 
-    cap_bbox = draw.textbbox((0, 0), capacity, font=capacity_font)
+    cap_bbox = text_bbox(capacity, 36, bold=True)
     cap_width = cap_bbox[2] - cap_bbox[0]
     cap_height = cap_bbox[3] - cap_bbox[1]
     cap_x = margin + 8
@@ -160,8 +197,8 @@ def create_label_image(drive_info: dict) -> Image.Image:
 
     cap_section_width = cap_x + cap_width + 12
     text_x = cap_section_width + 10
-    vendor_bbox = draw.textbbox((0, 0), vendor, font=make_model_font)
-    product_bbox = draw.textbbox((0, 0), product, font=make_model_font)
+    vendor_bbox = text_bbox(vendor, 17)
+    product_bbox = text_bbox(product, 17)
     vendor_height = vendor_bbox[3] - vendor_bbox[1]
     product_height = product_bbox[3] - product_bbox[1]
     total_text_height = vendor_height + product_height + 8
@@ -175,11 +212,11 @@ def create_label_image(drive_info: dict) -> Image.Image:
     # Fit serial number, shrinking font only if needed
     max_serial_width = width - 2 * margin
     for font_size in [38, 34, 30, 26, 22]:
-        serial_font = load_font(font_size, bold=True)
-        serial_bbox = draw.textbbox((0, 0), serial, font=serial_font)
+        serial_bbox = text_bbox(serial, font_size, bold=True)
         serial_width = serial_bbox[2] - serial_bbox[0]
         if serial_width <= max_serial_width:
             break
+    serial_font = load_font(font_size, bold=True)
     serial_x = (width - serial_width) // 2
     serial_y = bottom_rect_top + 6
 
@@ -191,66 +228,17 @@ def create_label_image(drive_info: dict) -> Image.Image:
     return img
 
 
-async def scan_for_printer() -> str | None:
-    """Scan for P31S printer and return its address."""
-    print("Scanning for P31S printers...")
-    printers = await BLEConnection.scan(timeout=5.0)
-    if not printers:
-        print("No printers found.")
-        return None
-    print(f"Found: {printers[0]}")
-    return printers[0].address
-
-
 async def print_image(img: Image.Image, conn: BLEConnection) -> bool:
     """Print an image to the P31S printer using existing connection."""
     # Rotate -90 degrees (clockwise) for portrait orientation (120x320)
-    img_rotated = img.rotate(-90, expand=True)
+    img_rotated = img.transpose(Image.Transpose.ROTATE_270)
 
     # Convert to 1-bit
     img_1bit = img_rotated.convert("1")
 
-    bitmap_width = img_1bit.width   # 120
-    bitmap_height = img_1bit.height  # 320
-
-    # Convert to TSPL bitmap format
-    width_bytes = (bitmap_width + 7) // 8
-    bitmap_data = bytearray()
-
-    for y in range(bitmap_height):
-        row_byte = 0
-        bit_pos = 7
-        for x in range(bitmap_width):
-            pixel = img_1bit.getpixel((x, y))
-            if pixel != 0:
-                row_byte |= (1 << bit_pos)
-            bit_pos -= 1
-            if bit_pos < 0:
-                bitmap_data.append(row_byte)
-                row_byte = 0
-                bit_pos = 7
-        if bit_pos != 7:
-            bitmap_data.append(row_byte)
-        while len(bitmap_data) % width_bytes != 0:
-            bitmap_data.append(0xFF)
-
-    # Dither solid black regions (thermal protection)
-    for i in range(len(bitmap_data)):
-        if bitmap_data[i] == 0x00 and i % 4 == 0:
-            bitmap_data[i] = 0x08
-
-    commands = []
-    commands.append(b"SIZE 14 mm,40 mm\r\n")
-    commands.append(b"GAP 2 mm,0 mm\r\n")
-    commands.append(b"DIRECTION 0,0\r\n")
-    commands.append(b"DENSITY 12\r\n")
-    commands.append(b"CLS\r\n")
-    commands.append(f"BITMAP 0,0,{width_bytes},{bitmap_height},1,".encode())
-    commands.append(bytes(bitmap_data))
-    commands.append(b"\r\n")
-    commands.append(b"PRINT 1\r\n")
-
-    job_data = b"".join(commands)
+    # Build the TSPL job (bitmap packing and thermal-protection dithering
+    # happen in p31s.tspl)
+    job_data = create_print_job(LABEL_14X40, img_1bit, Density.LEVEL_12)
 
     mtu = await conn.get_mtu()
     success = await conn.write_chunked(job_data, chunk_size=mtu)
@@ -258,6 +246,26 @@ async def print_image(img: Image.Image, conn: BLEConnection) -> bool:
     return success
 
 
+async def render_labels(drives: list[dict], queue: asyncio.Queue) -> None:
+    """Render label images off the event loop and queue them for printing.
+
+    Saves a preview PNG per label and puts None on the queue when done,
+    also when rendering fails, so the consumer never waits forever.
+    """
+    try:
+        for drive in drives:
+            img = await asyncio.to_thread(create_label_image, drive)
+
+            # Save preview
+            preview_path = f"label_{drive['serial']}.png"
+            await asyncio.to_thread(img.save, preview_path)
+            print(f"    Preview: {preview_path}")
+
+            await queue.put((drive, img))
+    finally:
+        await queue.put(None)
+
+
 async def main():
     parser = argparse.ArgumentParser(
         description='Generate and print hard drive labels from smartctl output.',
@@ -296,53 +304,72 @@ async def main():
 
     print(f"Found {len(all_drives)} drive(s)")
 
-    # Generate label images
-    labels = []
     for drive in all_drives:
         print(f"  - {drive['capacity']} {drive['vendor']} {drive['product']}: {drive['serial']}")
-        img = create_label_image(drive)
-        labels.append((drive, img))
-
-        # Save preview
-        preview_path = f"label_{drive['serial']}.png"
-        img.save(preview_path)
-        print(f"    Preview: {preview_path}")
 
     if args.preview_only:
+        await render_labels(all_drives, asyncio.Queue())
         print("Preview only mode - not printing.")
         return
 
-    # Connect to printer once and print all labels
-    address = await scan_for_printer()
-    if not address:
-        print("Cannot print - no printer found.")
-        sys.exit(1)
-
-    conn = BLEConnection()
-    print(f"Connecting to {address}...")
-
-    if not await conn.connect(address):
-        print("Failed to connect!")
-        sys.exit(1)
-
-    print("Connected!")
+    # Render labels in the background while connecting and
+    # printing; the bounded queue keeps at most two images ahead
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+    renderer = asyncio.create_task(render_labels(all_drives, queue))
 
     try:
-        for i, (drive, img) in enumerate(labels):
-            print(f"Printing label {i+1}/{len(labels)}: {drive['serial']}...")
-            success = await print_image(img, conn)
-            if success:
-                print(f"  Sent!")
-            else:
-                print(f"  Failed!")
-                continue
+        # Connect to printer once and print all labels; the last-used
+        # printer is tried first so repeat runs skip the BLE scan
+        print("Connecting to P31S printer...")
+        conn = await BLEConnection.connect_cached()
+        if conn is None:
+            print("Cannot print - no printer found.")
+            sys.exit(1)
 
-            # Wait for printer to finish before next label
-            if i < len(labels) - 1:
-                await asyncio.sleep(4.0)
+        print("Connected!")
+
+        try:
+            # Cleared after the first unanswered status query, so a printer
+            # without ESC ! ? support costs no more than the fixed delay
+            status_supported = True
+            loop = asyncio.get_running_loop()
+            i = 0
+            while (label := await queue.get()) is not None:
+                drive, img = label
+                i += 1
+                print(f"Printing label {i}/{len(all_drives)}: {drive['serial']}...")
+                success = await print_image(img, conn)
+                if success:
+                    print(f"  Sent!")
+                else:
+                    print(f"  Failed!")
+                    continue
+
+                # Wait for printer to finish before next label; fall back to
+                # the rest of the fixed delay if it doesn't report idle
+                if i < len(all_drives):
+                    sent_at = loop.time()
+                    await asyncio.sleep(MIN_LABEL_DELAY)
+                    idle = False
+                    if status_supported:
+                        try:
+                            idle = await asyncio.wait_for(conn.wait_idle(), timeout=10.0)
+                            # False means the query went unanswered; a timeout
+                            # means it answered busy throughout
+                            status_supported = idle
+                        except asyncio.TimeoutError:
+                            pass
+                    if not idle:
+                        await asyncio.sleep(max(0.0, LABEL_DELAY - (loop.time() - sent_at)))
+
+            # None also ends the queue when rendering failed; re-raise that
+            # error instead of reporting a short batch as done
+            await renderer
+        finally:
+            await conn.disconnect()
+            print("Disconnected")
     finally:
-        await conn.disconnect()
-        print("Disconnected")
+        renderer.cancel()
 
 
 if __name__ == '__main__':
@@ -6,11 +6,38 @@ Label: 40mm x 14mm (tall, narrow) at 203 DPI
 
 import asyncio
 import sys
+from functools import lru_cache
 
 sys.path.insert(0, "src")
 from PIL import Image, ImageDraw, ImageFont
 from p31s.connection import BLEConnection
+from p31s.tspl import Density, LabelSize, create_print_job
 
+# 14x40mm labels with a 2mm gap
+LABEL_14X40 = LabelSize(width=14, height=40, gap=2)
+
+
+@lru_cache(maxsize=4)
+def load_font(size: int):
+    """Load Helvetica at the given size once, falling back to PIL's default font."""
+    try:
+        return ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=128)
+def get_glyph(char: str, size: int) -> tuple[Image.Image, tuple[int, int, int, int]]:
+    """Return a "1" mode mask of a character and its bbox, rendering it once.
+
+    Cached on (char, size), so repeated letters skip FreeType across labels.
+    """
+    font = load_font(size)
+    mask = Image.new("1", (1, 1), 0)
+    bbox = ImageDraw.Draw(mask).textbbox((0, 0), char, font=font)
+    mask = Image.new("1", (max(bbox[2] - bbox[0], 1), max(bbox[3] - bbox[1], 1)), 0)
+    ImageDraw.Draw(mask).text((-bbox[0], -bbox[1]), char, font=font, fill=255)
+    return mask, bbox
 
 
 def create_label_image(text: str = "HELLO", width: int = 120, height: int = 320) -> Image.Image:
@@ -27,12 +54,7 @@ def create_label_image(text: str = "HELLO", width: int = 120, height: int = 320)
     pad_right = 0
     content_width = width - pad_left - pad_right  # 116px
 
-    try:
-        font_large = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 24)
-        font_small = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 12)
-    except:
-        font_large = ImageFont.load_default()
-        font_small = font_large
+    font_small = load_font(12)
 
     # Border rectangle (within content area)
     draw.rectangle([pad_left + 2, 2, width - pad_right - 3, height - 3], outline=0, width=2)
@@ -51,10 +73,10 @@ def create_label_image(text: str = "HELLO", width: int = 120, height: int = 320)
     text_y = 60
     center_x = pad_left + content_width // 2
     for i, char in enumerate(text):
-        bbox = draw.textbbox((0, 0), char, font=font_large)
+        glyph, bbox = get_glyph(char, 24)
         char_width = bbox[2] - bbox[0]
         char_x = center_x - char_width // 2
-        draw.text((char_x, text_y + i * 35), char, font=font_large, fill=0)
+        img.paste(0, (char_x + bbox[0], text_y + i * 35 + bbox[1]), glyph)
 
     # "P31S" label at bottom
     label_text = "P31S"
@@ -63,27 +85,19 @@ def create_label_image(text: str = "HELLO", width: int = 120, height: int = 320)
     draw.text((center_x - label_width // 2, height - 35), label_text, font=font_small, fill=0)
 
     # Checkerboard strip at very bottom (within content area)
-    for y in range(height - 18, height - 4):
-        for x in range(pad_left + 4, width - pad_right - 4):
-            if (x + y) % 4 < 2:
-                draw.point((x, y), fill=0)
+    # Black where (x + y) % 4 < 2: each mask row is the same 4-pixel stripe
+    # shifted by one per row, pasted in a single call
+    x0, x1 = pad_left + 4, width - pad_right - 4
+    y0, y1 = height - 18, height - 4
+    strip_width = x1 - x0
+    stripe = b"\xff\xff\x00\x00" * (strip_width // 4 + 2)
+    rows = (stripe[(x0 + y) % 4:][:strip_width] for y in range(y0, y1))
+    mask = Image.frombytes("L", (strip_width, y1 - y0), b"".join(rows))
+    img.paste(0, (x0, y0, x1, y1), mask)
 
     return img
 
 
-async def scan_for_printer() -> str | None:
-    """Scan for P31S printer and return its address."""
-    print("Scanning for P31S printers...")
-    printers = await BLEConnection.scan(timeout=5.0)
-
-    if not printers:
-        print("No printers found.")
-        return None
-
-    print(f"Found: {printers[0]}")
-    return printers[0].address
-
-
 async def print_label(text: str = "HELLO"):
     """Print a custom label."""
     print(f"Creating label with text: {text}")
@@ -96,65 +110,20 @@ async def print_label(text: str = "HELLO"):
     img.save("label_preview.png")
     print(f"Preview saved: label_preview.png ({img.width}x{img.height})")
 
-    # Convert to TSPL bitmap format
-    width_bytes = (bitmap_width + 7) // 8
-    bitmap_data = bytearray()
-
-    for y in range(bitmap_height):
-        row_byte = 0
-        bit_pos = 7
-        for x in range(bitmap_width):
-            pixel = img.getpixel((x, y))
-            if pixel != 0:
-                row_byte |= (1 << bit_pos)
-            bit_pos -= 1
-            if bit_pos < 0:
-                bitmap_data.append(row_byte)
-                row_byte = 0
-                bit_pos = 7
-        if bit_pos != 7:
-            bitmap_data.append(row_byte)
-        while len(bitmap_data) % width_bytes != 0:
-            bitmap_data.append(0xFF)
-
-    # Dither solid black regions (thermal protection)
-    for i in range(len(bitmap_data)):
-        if bitmap_data[i] == 0x00 and i % 4 == 0:
-            bitmap_data[i] = 0x08
-
-    print(f"Bitmap: {width_bytes}x{bitmap_height} = {len(bitmap_data)} bytes")
-
-    # Scan for printer first
-    address = await scan_for_printer()
-    if not address:
-        return False
+    # Build the TSPL job: bitmap at the top-left corner (full 120px width,
+    # top edge verified optimal), dithered for thermal protection
+    job_data = create_print_job(LABEL_14X40, img, Density.LEVEL_12)
 
-    # Connect
-    conn = BLEConnection()
-    print(f"Connecting to {address}...")
-
-    if not await conn.connect(address):
-        print("Failed to connect!")
+    # Connect, trying the last-used printer before scanning
+    print("Connecting to P31S printer...")
+    conn = await BLEConnection.connect_cached()
+    if conn is None:
+        print("No printers found.")
         return False
     
     print("Connected!")
     
     try:
-        x_offset = 0  # Full width bitmap (96px)
-        y_offset = 0  # Start at top edge (verified optimal)
-        
-        commands = []
-        commands.append(b"SIZE 14 mm,40 mm\r\n")
-        commands.append(b"GAP 2 mm,0 mm\r\n")
-        commands.append(b"DIRECTION 0,0\r\n")
-        commands.append(b"DENSITY 12\r\n")
-        commands.append(b"CLS\r\n")
-        commands.append(f"BITMAP {x_offset},{y_offset},{width_bytes},{bitmap_height},1,".encode())
-        commands.append(bytes(bitmap_data))
-        commands.append(b"\r\n")
-        commands.append(b"PRINT 1\r\n")
-        
-        job_data = b"".join(commands)
         print(f"Total job size: {len(job_data)} bytes")
         
         mtu = await conn.get_mtu()
@@ -21,10 +21,14 @@ Where:
 - Each chunk has 2-byte sequence number prefix and 1-byte XOR suffix
 """
 
+import argparse
 import io
+import operator
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, reduce
 import serial
-from PIL import Image
+from PIL import Image, ImageDraw
 
 # Try to import LZO compression
 try:
@@ -43,53 +47,79 @@ BAUD_RATE = 115200
 CHUNK_DATA_SIZE = 8189  # Max data bytes per chunk
 CHUNK_SIZE_HEADER = 8192  # Value in header
 CHUNK_WRITE_SIZE = 1024  # Actual write chunk size to serial
+SEND_DELAY = 0.001  # Pause between write chunks unless flow control is on
 CRLF = b"\r\n"
 
 
-def build_chunks_with_sn_xor(data: bytes, chunk_size: int = CHUNK_DATA_SIZE) -> list[bytes]:
-    """Build data chunks with sequence number and XOR checksum."""
-    chunks = []
+def xor_checksum(data: bytes | memoryview) -> int:
+    """XOR of all bytes in data."""
+    # XOR eight bytes at a time as 64-bit words, then fold the accumulator
+    # down to one byte. XOR is associative and commutative, so this gives
+    # the same result as the byte loop (byte order doesn't matter either).
+    view = memoryview(data)
+    n8 = len(view) & ~7
+    acc = reduce(operator.xor, view[:n8].cast('Q'), 0)
+    acc ^= acc >> 32
+    acc ^= acc >> 16
+    acc ^= acc >> 8
+    return reduce(operator.xor, view[n8:], acc & 0xFF)
+
+
+def build_chunks_with_sn_xor(data: bytes, chunk_size: int = CHUNK_DATA_SIZE) -> tuple[bytearray, int]:
+    """Build data chunks with sequence number and XOR checksum.
+
+    Returns the framed chunks back to back in one buffer, plus the chunk
+    count. Chunk i is payload[i * (chunk_size + 3):(i + 1) * (chunk_size + 3)].
+    """
     num_chunks = (len(data) + chunk_size - 1) // chunk_size
+    payload = bytearray(len(data) + 3 * num_chunks)
+    view = memoryview(data)
+    offset = 0
 
-    for i in range(num_chunks):
-        start = i * chunk_size
-        end = min(start + chunk_size, len(data))
-        chunk_data = data[start:end]
+    # Slicing clamps at the end of data, so only the last chunk comes up
+    # short and no per-chunk bounds check is needed
+    for i, start in enumerate(range(0, len(data), chunk_size)):
+        chunk_data = view[start:start + chunk_size]  # zero-copy
+        end = offset + 2 + len(chunk_data)
 
-        # Build packet: [SN_HIGH][SN_LOW][DATA...][XOR]
-        sn_high = (i >> 8) & 0xFF
-        sn_low = i & 0xFF
+        # [SN_HIGH][SN_LOW][DATA...][XOR], XOR checksum of data only
+        payload[offset] = (i >> 8) & 0xFF
+        payload[offset + 1] = i & 0xFF
+        payload[offset + 2:end] = chunk_data
+        payload[end] = xor_checksum(chunk_data)
+        offset = end + 1
 
-        # XOR checksum of data only
-        xor = 0
-        for b in chunk_data:
-            xor ^= b
+    return payload, num_chunks
 
-        packet = bytes([sn_high, sn_low]) + chunk_data + bytes([xor])
-        chunks.append(packet)
 
-    return chunks
+@lru_cache(maxsize=32)
+def _lzo_compress(data: bytes) -> bytes:
+    """LZO level 1 compression, cached so resending the same image is free."""
+    return lzo.compress(data, 1)
 
 
 def compress_data(data: bytes) -> bytes:
     """Compress data using LZO if available."""
     if HAS_LZO:
-        compressed = lzo.compress(data, 1)  # Level 1 compression
+        compressed = _lzo_compress(data)
         print(f"  LZO compressed: {len(data)} -> {len(compressed)} bytes")
         return compressed
     return data
 
 
+@lru_cache(maxsize=8)
 def create_test_image(width: int = 120, height: int = 30) -> bytes:
-    """Create a simple test image and return as JPEG bytes."""
+    """Create a simple test image and return as JPEG bytes.
+
+    The image only depends on its size, so the encoded JPEG is cached.
+    """
     img = Image.new('RGB', (width, height), 'white')
-    from PIL import ImageDraw
     draw = ImageDraw.Draw(img)
     draw.rectangle([5, 5, 25, 25], fill='black')
     draw.text((35, 8), "P31S", fill='black')
 
     # Rotate 180 degrees (as the APK does)
-    img = img.rotate(180)
+    img = img.transpose(Image.Transpose.ROTATE_180)
 
     # Convert to JPEG with quality 60 (as the APK does)
     buf = io.BytesIO()
@@ -97,29 +127,49 @@ def create_test_image(width: int = 120, height: int = 30) -> bytes:
     return buf.getvalue()
 
 
-def send_chunked(ser: serial.Serial, data: bytes, chunk_size: int = CHUNK_WRITE_SIZE, delay: float = 0.001):
-    """Send data in chunks with small delays."""
+def send_chunked(ser: serial.Serial, data: bytes, chunk_size: int = CHUNK_WRITE_SIZE,
+                 delay: float = SEND_DELAY):
+    """Send data in chunks with small delays.
+
+    With delay=0 the data goes out in one write. Only do that with RTS/CTS
+    flow control enabled (--flow-control), so the write blocks while the
+    printer's buffer is full instead of overrunning it.
+    """
+    if delay <= 0:
+        # No pacing: one write, and let the tty driver split it up
+        ser.write(data)
+        ser.flush()
+        return
+
     for i in range(0, len(data), chunk_size):
         chunk = data[i:i + chunk_size]
         ser.write(chunk)
-        if delay > 0:
-            time.sleep(delay)
+        time.sleep(delay)
     ser.flush()
 
 
 def wait_for_response(ser: serial.Serial, timeout: float = 5.0) -> bytes | None:
     """Wait for response from printer."""
-    start = time.time()
-    while time.time() - start < timeout:
-        if ser.in_waiting:
-            time.sleep(0.1)  # Wait a bit more for complete response
-            return ser.read(ser.in_waiting)
-        time.sleep(0.1)
-    return None
+    saved_timeout = ser.timeout
+    try:
+        # Block in the kernel until the first byte arrives instead of polling
+        ser.timeout = timeout
+        response = ser.read(1)
+        if not response:
+            return None
+
+        # Then drain the rest, stopping once the line is quiet for 50 ms
+        ser.timeout = 0.05
+        while chunk := ser.read(ser.in_waiting or 1):
+            response += chunk
+        return response
+    finally:
+        ser.timeout = saved_timeout
 
 
 def print_image(ser: serial.Serial, jpeg_data: bytes, width: int, height: int,
-                x: int = 0, y: int = 0, quality: int = 0, use_compression: bool = True) -> bool:
+                x: int = 0, y: int = 0, quality: int = 0, use_compression: bool = True,
+                send_delay: float = SEND_DELAY) -> bool:
     """
     Send image to printer using BITMAP_SN protocol.
 
@@ -131,6 +181,7 @@ def print_image(ser: serial.Serial, jpeg_data: bytes, width: int, height: int,
         x, y: Position on label
         quality: 0=FAST, 2=PHOTO
         use_compression: Whether to use LZO compression
+        send_delay: Pause between write chunks (0 = one unpaced write)
 
     Returns:
         True if successful
@@ -143,30 +194,23 @@ def print_image(ser: serial.Serial, jpeg_data: bytes, width: int, height: int,
         data_to_send = compress_data(jpeg_data)
 
     # Build chunks with sequence numbers and XOR
-    chunks = build_chunks_with_sn_xor(data_to_send, CHUNK_DATA_SIZE)
-    print(f"  Chunks: {len(chunks)}")
+    payload, num_chunks = build_chunks_with_sn_xor(data_to_send, CHUNK_DATA_SIZE)
+    print(f"  Chunks: {num_chunks}")
 
     # Build BITMAP_SN header
     bitmap_model = 4  # JPEG
-    header = f"BITMAP_SN {x},{y},{width},{height},{quality},{bitmap_model},{len(data_to_send)},{len(chunks)},{CHUNK_SIZE_HEADER},"
-    print(f"  Header: {header}")
+    header = b"BITMAP_SN %d,%d,%d,%d,%d,%d,%d,%d,%d," % (
+        x, y, width, height, quality, bitmap_model, len(data_to_send), num_chunks, CHUNK_SIZE_HEADER)
+    print(f"  Header: {header.decode('ascii')}")
 
-    # Construct full packet
-    if len(chunks) == 1:
-        # Single chunk: header + chunk + CRLF
-        packet = header.encode('ascii') + chunks[0] + CRLF
-    else:
-        # Multi-chunk: (header + chunk), (chunk)..., (chunk + CRLF)
-        packet = header.encode('ascii') + chunks[0]
-        for chunk in chunks[1:-1]:
-            packet += chunk
-        packet += chunks[-1] + CRLF
+    # Construct full packet: header + chunks + CRLF
+    packet = b"".join((header, payload, CRLF))
 
     print(f"  Total packet: {len(packet)} bytes")
 
     # Send
     print("  Sending...")
-    send_chunked(ser, packet)
+    send_chunked(ser, packet, delay=send_delay)
 
     # Wait for response
     print("  Waiting for response...")
@@ -174,8 +218,8 @@ def print_image(ser: serial.Serial, jpeg_data: bytes, width: int, height: int,
 
     if response:
         print(f"  Response: {response.hex()}")
-        # 0xAA = success
-        if 0xAA in response:
+        # 0xAA = success, sent as the first byte of the reply
+        if response[0] == 0xAA:
             print("  SUCCESS! (0xAA received)")
             return True
         # Check for BITMAP_SN_RESEND
@@ -192,7 +236,7 @@ def print_image(ser: serial.Serial, jpeg_data: bytes, width: int, height: int,
 def query_status(ser: serial.Serial) -> int | None:
     """Query printer status. Returns status byte or None."""
     ser.reset_input_buffer()
-    ser.write(bytes([0x1b, 0x21, 0x3f, 0x0d, 0x0a]))  # ESC ! ? \r\n
+    ser.write(b"\x1b!?\r\n")  # ESC ! ? \r\n
     ser.flush()
 
     response = wait_for_response(ser, timeout=2.0)
@@ -203,6 +247,13 @@ def query_status(ser: serial.Serial) -> int | None:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="P31S printer protocol test over SPP.")
+    parser.add_argument("--flow-control", action="store_true",
+                        help="Open the port with RTS/CTS flow control and send data "
+                             "unpaced (only if the SPP link is known to honour CTS)")
+    args = parser.parse_args()
+    send_delay = 0 if args.flow_control else SEND_DELAY
+
     print("P31S Printer Test")
     print("=" * 60)
 
@@ -216,7 +267,11 @@ def main():
     # Open serial port
     print(f"Opening {SERIAL_PORT}...")
     try:
-        ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=2, write_timeout=2)
+        if args.flow_control:
+            # Writes block on CTS, so allow longer than an unpaced chunk takes
+            ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=2, write_timeout=10, rtscts=True)
+        else:
+            ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=2, write_timeout=2)
         print("Connected!")
     except Exception as e:
         print(f"Failed to open serial port: {e}")
@@ -271,12 +326,19 @@ def main():
         jpeg_data = create_test_image(120, 30)
         print(f"Created test image: 120x30, {len(jpeg_data)} bytes JPEG")
 
-        # Try without compression first
-        success = print_image(ser, jpeg_data, 120, 30, use_compression=False)
+        # Try without compression first. Meanwhile compress in the background
+        # (the result lands in the compression cache), so a fallback to LZO
+        # doesn't have to start from scratch after the send and response wait.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            lzo_ready = pool.submit(_lzo_compress, jpeg_data) if HAS_LZO else None
+            success = print_image(ser, jpeg_data, 120, 30, use_compression=False,
+                                  send_delay=send_delay)
 
-        if not success and HAS_LZO:
-            print("\nTrying with LZO compression...")
-            success = print_image(ser, jpeg_data, 120, 30, use_compression=True)
+            if not success and lzo_ready:
+                lzo_ready.result()
+                print("\nTrying with LZO compression...")
+                success = print_image(ser, jpeg_data, 120, 30, use_compression=True,
+                                      send_delay=send_delay)
 
         if success:
             print("\nPrint successful!")
@@ -303,10 +365,10 @@ def main():
         time.sleep(0.1)
 
         # BITMAP command (old format)
-        header = f"BITMAP 0,0,120,30,0,4,{len(jpeg_data)},"
-        packet = header.encode('ascii') + jpeg_data + CRLF
-        print(f"Sending: {header}[{len(jpeg_data)} bytes JPEG]\\r\\n")
-        send_chunked(ser, packet)
+        header = b"BITMAP 0,0,120,30,0,4,%d," % len(jpeg_data)
+        packet = header + jpeg_data + CRLF
+        print(f"Sending: {header.decode('ascii')}[{len(jpeg_data)} bytes JPEG]\\r\\n")
+        send_chunked(ser, packet, delay=send_delay)
         time.sleep(0.2)
 
         # PRINT command
@@ -5,13 +5,14 @@ Requires optional dependencies:
     pip install p31s[barcodes]
 """
 
-from io import BytesIO
+from functools import lru_cache
 from typing import Literal, Optional
 
 from PIL import Image
 
 # Barcode types supported
 BarcodeType = Literal["code128", "code39", "ean13", "upca"]
+_BARCODE_TYPES = ("code128", "code39", "ean13", "upca")
 
 # QR code error correction levels
 QRErrorCorrection = Literal["L", "M", "Q", "H"]
@@ -23,6 +24,9 @@ QR_SIZES = {
     "large": (6, 4),
 }
 
+# Grayscale to 1-bit point table: below 128 is black, the rest white
+_THRESHOLD_TABLE = [0] * 128 + [255] * 128
+
 
 def _check_barcode_dependency() -> None:
     """Check that python-barcode is installed."""
@@ -45,6 +49,14 @@ def _check_qrcode_dependency() -> None:
         ) from None
 
 
+@lru_cache(maxsize=8)
+def _barcode_class(barcode_type: str) -> type:
+    """Look up the python-barcode class for a barcode type, once per type."""
+    import barcode
+
+    return barcode.get_barcode_class(barcode_type)
+
+
 def generate_barcode(
     data: str,
     barcode_type: BarcodeType = "code128",
@@ -71,23 +83,15 @@ def generate_barcode(
     """
     _check_barcode_dependency()
 
-    import barcode
     from barcode.writer import ImageWriter
 
-    # Map our types to python-barcode types
-    type_map = {
-        "code128": "code128",
-        "code39": "code39",
-        "ean13": "ean13",
-        "upca": "upca",
-    }
-
-    if barcode_type not in type_map:
+    # Our type names are python-barcode's own names
+    if barcode_type not in _BARCODE_TYPES:
         raise ValueError(
-            f"Invalid barcode type: {barcode_type}. Supported types: {list(type_map.keys())}"
+            f"Invalid barcode type: {barcode_type}. Supported types: {list(_BARCODE_TYPES)}"
         )
 
-    barcode_class = barcode.get_barcode_class(type_map[barcode_type])
+    barcode_class = _barcode_class(barcode_type)
 
     # Configure the writer
     writer = ImageWriter()
@@ -99,14 +103,12 @@ def generate_barcode(
         "quiet_zone": 2,
     }
 
-    # Create the barcode
+    # Create the barcode. ImageWriter renders to a PIL image, so take it
+    # directly rather than round-tripping through an encoded PNG
     bc = barcode_class(data, writer=writer)
-    buffer = BytesIO()
-    bc.write(buffer, options=options)
-    buffer.seek(0)
+    img = bc.render(options)
 
-    # Load and convert to 1-bit
-    img = Image.open(buffer)
+    # Convert to 1-bit
     img = img.convert("L")  # Grayscale first
 
     # Resize if width specified
@@ -116,7 +118,7 @@ def generate_barcode(
         img = img.resize((width, new_height), Image.Resampling.LANCZOS)
 
     # Convert to 1-bit with threshold
-    img = img.point(lambda x: 0 if x < 128 else 255, mode="1")
+    img = img.point(_THRESHOLD_TABLE, mode="1")
 
     return img
 
@@ -173,15 +175,13 @@ def generate_qr(
     qr.add_data(data)
     qr.make(fit=True)
 
-    # Generate image
-    img = qr.make_image(fill_color="black", back_color="white")
-
-    # Convert to PIL Image if needed (qrcode returns PilImage wrapper)
-    if hasattr(img, "get_image"):
-        img = img.get_image()
+    # Build the image from the module matrix (border included, True = dark)
+    # at one pixel per module, then scale it up to box_size in one resize,
+    # rather than having qrcode draw every module as a rectangle
+    matrix = qr.get_matrix()
+    modules = len(matrix)
+    pixels = bytes(0 if dark else 255 for row in matrix for dark in row)
+    img = Image.frombytes("L", (modules, modules), pixels)
+    img = img.resize((modules * box_size, modules * box_size), Image.Resampling.NEAREST)
 
-    # Ensure 1-bit mode
-    if img.mode != "1":
-        img = img.convert("1")
-
-    return img
+    return img.convert("1", dither=Image.Dither.NONE)
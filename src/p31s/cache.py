@@ -2,21 +2,33 @@
 Printer address caching for remembering last-used printer.
 
 Stores the last successfully connected printer address to avoid
-repeated scanning/selection across commands.
+repeated scanning/selection across commands. The printers found by the
+most recent scan are kept for a short while too, so a command run right
+after a scan can offer them without scanning again.
 """
 
 import json
+import os
+import tempfile
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 # Default cache TTL: 24 hours
 DEFAULT_TTL_SECONDS = 24 * 60 * 60
 
+# Default scan results TTL: 1 minute (printers come and go)
+DEFAULT_SCAN_TTL_SECONDS = 60
+
 # Config directory location
 CONFIG_DIR = Path.home() / ".config" / "p31s"
 CACHE_FILE = CONFIG_DIR / "last_printer"
+SCAN_CACHE_FILE = CONFIG_DIR / "last_scan"
+
+# Fields of a cached scan entry (connection.PrinterInfo) and their types
+_SCAN_ENTRY_FIELDS = {"name": str, "address": str, "rssi": int, "mac_address": (str, type(None))}
+_SCAN_ENTRY_REQUIRED = {"name", "address", "rssi"}
 
 
 @dataclass
@@ -37,7 +49,13 @@ def load_cached_printer(ttl_seconds: int = DEFAULT_TTL_SECONDS) -> Optional[Cach
     Returns:
         CachedPrinter if valid cache exists, None otherwise.
     """
-    if not CACHE_FILE.exists():
+    # The file's mtime is when it was last saved, so a stale cache can be
+    # rejected from one stat() without reading or parsing it
+    try:
+        mtime = CACHE_FILE.stat().st_mtime
+    except OSError:
+        return None
+    if time.time() - mtime > ttl_seconds:
         return None
 
     try:
@@ -74,7 +92,7 @@ def save_printer(address: str, name: str) -> None:
         "name": name,
         "last_used": time.time(),
     }
-    CACHE_FILE.write_text(json.dumps(data, indent=2))
+    _write_atomic(CACHE_FILE, data)
 
 
 def clear_cache() -> bool:
@@ -87,3 +105,103 @@ def clear_cache() -> bool:
         CACHE_FILE.unlink()
         return True
     return False
+
+
+def load_scan_results(
+    timeout: float, ttl_seconds: int = DEFAULT_SCAN_TTL_SECONDS
+) -> Optional[list[dict[str, Any]]]:
+    """Load the printers found by a recent scan.
+
+    Results are only reused if the cached scan ran at least as long as
+    the one being asked for, since a shorter scan may have missed printers.
+
+    Args:
+        timeout: Scan timeout in seconds that the caller would scan with.
+        ttl_seconds: Maximum age of the scan results in seconds. Default 60.
+
+    Returns:
+        List of printer fields as saved by save_scan_results (PrinterInfo
+        keyword arguments) if a fresh, long enough scan is cached, None
+        otherwise.
+    """
+    try:
+        mtime = SCAN_CACHE_FILE.stat().st_mtime
+    except OSError:
+        return None
+    if time.time() - mtime > ttl_seconds:
+        return None
+
+    try:
+        data = json.loads(SCAN_CACHE_FILE.read_text())
+        if time.time() - data["scanned_at"] > ttl_seconds or data["timeout"] < timeout:
+            return None
+        printers = data["printers"]
+        if not isinstance(printers, list) or not all(map(_is_scan_entry, printers)):
+            # Hand-edited or older format - rescan rather than fail later
+            return None
+        return printers
+    except (json.JSONDecodeError, KeyError, TypeError):
+        # Invalid cache file - treat as missing
+        return None
+
+
+def save_scan_results(printers: list[dict[str, Any]], timeout: float) -> None:
+    """Save the printers found by a scan.
+
+    Args:
+        printers: Fields of each printer found (PrinterInfo as a dict), in
+            the order they were listed
+        timeout: Scan timeout in seconds the scan ran with
+    """
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+
+    data = {
+        "scanned_at": time.time(),
+        "timeout": timeout,
+        "printers": printers,
+    }
+    _write_atomic(SCAN_CACHE_FILE, data)
+
+
+def clear_scan_cache() -> bool:
+    """Clear the cached scan results.
+
+    Returns:
+        True if scan results were cleared, False if none were cached.
+    """
+    if SCAN_CACHE_FILE.exists():
+        SCAN_CACHE_FILE.unlink()
+        return True
+    return False
+
+
+def _is_scan_entry(entry: Any) -> bool:
+    """Check a cached scan entry has exactly the PrinterInfo fields and types."""
+    return (
+        isinstance(entry, dict)
+        and _SCAN_ENTRY_REQUIRED <= entry.keys() <= _SCAN_ENTRY_FIELDS.keys()
+        and all(isinstance(entry[key], _SCAN_ENTRY_FIELDS[key]) for key in entry)
+    )
+
+
+def _write_atomic(path: Path, data: dict) -> None:
+    """Write JSON to a temporary file and rename it into place.
+
+    A concurrent load never sees a half-written file. Each write gets its
+    own temporary file in the same directory, so two processes saving at
+    once can't rename each other's half-written file into place.
+    """
+    # Serialize first, so an unserializable value fails before any file exists
+    text = json.dumps(data, indent=2)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    ) as tmp:
+        try:
+            tmp.write(text)
+            tmp.close()
+            os.replace(tmp.name, path)
+        except BaseException:
+            # Don't leave the temporary file behind, whatever went wrong
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
@@ -11,14 +11,23 @@ Usage:
 """
 
 import asyncio
-import re
+import logging
 import sys
+from dataclasses import asdict
 from typing import Optional
 
 import click
 
 from .barcodes import generate_barcode, generate_qr
-from .cache import clear_cache, load_cached_printer, save_printer
+from .cache import (
+    clear_cache,
+    clear_scan_cache,
+    load_cached_printer,
+    load_scan_results,
+    save_printer,
+    save_scan_results,
+)
+from .connection import PrinterInfo
 from .coverage import generate_coverage_pattern
 from .printer import (
     ConnectionError,
@@ -29,13 +38,28 @@ from .printer import (
 )
 from .tspl import Density
 
-# Bluetooth MAC address format: XX:XX:XX:XX:XX:XX (hex pairs separated by colons)
-BLUETOOTH_MAC_PATTERN = re.compile(r"^([0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}$")
+# Characters allowed between the separators of a Bluetooth address
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
 
-# macOS CoreBluetooth UUID format: XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX
-MACOS_UUID_PATTERN = re.compile(
-    r"^[0-9A-Fa-f]{8}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{12}$"
-)
+
+def _is_bluetooth_address(value: str) -> bool:
+    """Check the shape of a MAC or macOS UUID address without a regex.
+
+    Both formats have a fixed length with separators at fixed positions,
+    so dispatch on the length, compare the separators by slice and check
+    the remaining characters against the hex digit set.
+    """
+    if len(value) == 17:
+        # XX:XX:XX:XX:XX:XX - colons at 2, 5, 8, 11, 14
+        return value[2::3] == ":::::" and _HEX_DIGITS.issuperset(value[0::3] + value[1::3])
+    if len(value) == 36:
+        # XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX - dashes at 8, 13, 18, 23
+        return (
+            value[8:24:5] == "----"
+            and value.count("-") == 4
+            and _HEX_DIGITS.issuperset(value.replace("-", ""))
+        )
+    return False
 
 
 def validate_bluetooth_address(ctx, param, value):
@@ -58,9 +82,7 @@ def validate_bluetooth_address(ctx, param, value):
     """
     if value is None:
         return None
-    if BLUETOOTH_MAC_PATTERN.match(value):
-        return value.upper()
-    if MACOS_UUID_PATTERN.match(value):
+    if _is_bluetooth_address(value):
         return value.upper()
     raise click.BadParameter(
         f"Invalid Bluetooth address format: '{value}'. "
@@ -90,10 +112,12 @@ async def scan_and_select(timeout: float = 10.0, rescan: bool = False) -> Option
     """Scan for printers and let user select one interactively.
 
     Checks cache first unless rescan is True. Saves selected printer to cache.
+    Without a cached printer, the results of a scan from the last minute are
+    offered instead of scanning again (again unless rescan is True).
 
     Args:
         timeout: Scan timeout in seconds
-        rescan: If True, skip cache and force new scan
+        rescan: If True, skip both caches and force new scan
 
     Returns:
         Selected printer address, or None if no printer selected
@@ -107,8 +131,7 @@ async def scan_and_select(timeout: float = 10.0, rescan: bool = False) -> Option
             click.echo("(use --rescan to find a different printer)")
             return cached.address
 
-    click.echo(f"Scanning for printers ({timeout}s)...")
-    printers = await P31SPrinter.scan(timeout=timeout)
+    printers = await _scan_or_load(timeout, rescan)
 
     if not printers:
         click.echo("No printers found.", err=True)
@@ -146,13 +169,49 @@ async def scan_and_select(timeout: float = 10.0, rescan: bool = False) -> Option
             return None
 
 
+async def _scan_or_load(timeout: float, rescan: bool = False) -> list[PrinterInfo]:
+    """Reuse recent scan results if there are any, otherwise scan and save them.
+
+    Args:
+        timeout: Scan timeout in seconds
+        rescan: If True, ignore cached scan results
+
+    Returns:
+        Printers found, sorted by signal strength
+    """
+    if not rescan:
+        cached = load_scan_results(timeout)
+        if cached:
+            click.echo("Using printers from a recent scan (use --rescan to scan again)")
+            return [PrinterInfo(**printer) for printer in cached]
+
+    click.echo(f"Scanning for printers ({timeout}s)...")
+    printers = await P31SPrinter.scan(timeout=timeout)
+    if printers:
+        save_scan_results([asdict(printer) for printer in printers], timeout)
+    return printers
+
+
 @click.group()
 @click.option("--debug/--no-debug", default=False, help="Enable debug output")
+@click.option(
+    "--chunk-delay",
+    type=click.FloatRange(0.0, 1000.0),
+    default=10.0,
+    show_default=True,
+    help="Delay between print data chunks in ms (0 = pipelined writes, untested on hardware)",
+)
 @click.pass_context
-def main(ctx, debug):
+def main(ctx, debug, chunk_delay):
     """P31S Label Printer CLI."""
     ctx.ensure_object(dict)
     ctx.obj["debug"] = debug
+    ctx.obj["chunk_delay_ms"] = chunk_delay
+
+    if debug:
+        # Surface the library's debug logging (e.g. characteristic discovery)
+        logging.basicConfig(format="[%(name)s] %(message)s")
+        logging.getLogger("p31s").setLevel(logging.DEBUG)
 
 
 @main.command("help")
@@ -213,6 +272,9 @@ def scan(timeout, no_auto):
             click.echo("No printers found.")
             return
 
+        # Let a command run right after this one pick from these results
+        save_scan_results([asdict(printer) for printer in printers], timeout)
+
         # Auto-select when exactly one printer found (unless --no-auto)
         if len(printers) == 1 and not no_auto:
             printer = printers[0]
@@ -256,7 +318,7 @@ def discover(ctx, address, rescan):
             if address is None:
                 sys.exit(1)
 
-        printer = P31SPrinter()
+        printer = P31SPrinter(chunk_delay_ms=ctx.obj["chunk_delay_ms"])
         printer.set_debug(ctx.obj["debug"])
 
         click.echo(f"Connecting to {address}...")
@@ -328,7 +390,7 @@ def print_image(ctx, image, address, density, copies, retry, rescan):
             if address is None:
                 sys.exit(1)
 
-        printer = P31SPrinter()
+        printer = P31SPrinter(chunk_delay_ms=ctx.obj["chunk_delay_ms"])
         printer.set_debug(ctx.obj["debug"])
 
         click.echo(f"Connecting to {address}...")
@@ -403,7 +465,7 @@ def test(ctx, address, retry, rescan):
             if address is None:
                 sys.exit(1)
 
-        printer = P31SPrinter()
+        printer = P31SPrinter(chunk_delay_ms=ctx.obj["chunk_delay_ms"])
         printer.set_debug(ctx.obj["debug"])
 
         click.echo(f"Connecting to {address}...")
@@ -484,7 +546,7 @@ def raw(ctx, hex_data, address, force, rescan):
             if address is None:
                 sys.exit(1)
 
-        printer = P31SPrinter()
+        printer = P31SPrinter(chunk_delay_ms=ctx.obj["chunk_delay_ms"])
         printer.set_debug(True)  # Always debug for raw commands
 
         try:
@@ -588,7 +650,7 @@ def barcode(ctx, data, address, barcode_type, density, copies, no_text, retry, r
             click.echo(f"Invalid barcode data: {e}", err=True)
             sys.exit(1)
 
-        printer = P31SPrinter()
+        printer = P31SPrinter(chunk_delay_ms=ctx.obj["chunk_delay_ms"])
         printer.set_debug(ctx.obj["debug"])
 
         click.echo(f"Connecting to {address}...")
@@ -716,7 +778,7 @@ def qr(ctx, data, address, size, error_correction, density, copies, retry, resca
             )
             img = img.resize(new_size, resample=0)  # 0=NEAREST for sharp pixels
 
-        printer = P31SPrinter()
+        printer = P31SPrinter(chunk_delay_ms=ctx.obj["chunk_delay_ms"])
         printer.set_debug(ctx.obj["debug"])
 
         click.echo(f"Connecting to {address}...")
@@ -809,7 +871,7 @@ def test_coverage(ctx, address, width, height, x_offset, y_offset, density, retr
         click.echo(f"Generating coverage pattern ({width}x{height} px)...")
         pattern = generate_coverage_pattern(width=width, height=height)
 
-        printer = P31SPrinter()
+        printer = P31SPrinter(chunk_delay_ms=ctx.obj["chunk_delay_ms"])
         printer.set_debug(ctx.obj["debug"])
 
         click.echo(f"Connecting to {address}...")
@@ -862,6 +924,8 @@ def forget():
     Removes the remembered printer so the next command will scan for printers
     again instead of using the cached one.
     """
+    # Recent scan results would otherwise stand in for the scan
+    clear_scan_cache()
     cached = load_cached_printer()
     if cached:
         if clear_cache():
@@ -904,7 +968,7 @@ def status(ctx, address, rescan):
             if address is None:
                 sys.exit(1)
 
-        printer = P31SPrinter()
+        printer = P31SPrinter(chunk_delay_ms=ctx.obj["chunk_delay_ms"])
         printer.set_debug(ctx.obj["debug"])
 
         click.echo(f"Connecting to {address}...")
@@ -5,14 +5,20 @@ Handles Bluetooth Low Energy communication using the Bleak library.
 """
 
 import asyncio
+import logging
 import platform
+from collections import deque
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Callable, Optional, Union
 
 from bleak import BleakClient, BleakScanner
 from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.backends.device import BLEDevice
 
+from .cache import load_cached_printer, save_printer
+
+logger = logging.getLogger(__name__)
+
 
 def rssi_to_bar(rssi: int, width: int = 5) -> str:
     """Convert RSSI value to visual signal strength bar.
@@ -79,11 +85,18 @@ class BLEConnection:
 
     # Known device name patterns
     DEVICE_PATTERNS = ["P31", "POLONO", "MAKEID", "NIIMBOT", "LABEL"]
+    # Uppercased once, so scan() only uppercases each advertised name
+    _UPPER_PATTERNS = tuple(pattern.upper() for pattern in DEVICE_PATTERNS)
 
     # Response queue limits (security: prevent memory exhaustion from malicious devices)
     MAX_QUEUE_SIZE = 100  # Maximum number of queued notifications
     MAX_RESPONSE_SIZE = 4096  # Maximum size of a single notification (bytes)
 
+    # TSPL status query (ESC ! ?). Per the TSPL spec the reply is a single
+    # status byte, 0x00 when idle; not verified on the P31S (docs/protocol.md)
+    STATUS_QUERY = b"\x1b!?"
+    STATUS_IDLE = 0x00
+
     # Primary service/characteristic UUIDs (discovered from Labelnize APK)
     PRIMARY_SERVICE = "0000ff00-0000-1000-8000-00805f9b34fb"
     CHAR_READ = "0000ff01-0000-1000-8000-00805f9b34fb"
@@ -103,12 +116,24 @@ class BLEConnection:
         "49535343-fe7d-4ae5-8fa9-9fafd205e455",  # Microchip UART
     ]
 
-    def __init__(self):
+    def __init__(self, tx_queue_depth: int = 16):
+        """
+        Initialize connection handler.
+
+        Args:
+            tx_queue_depth: Maximum write-without-response chunks kept in
+                flight by write_chunked when no inter-chunk delay is used
+        """
+        self.tx_queue_depth = tx_queue_depth
         self.client: Optional[BleakClient] = None
         self.device: Optional[BLEDevice] = None
-        self.write_char: Optional[str] = None
-        self.notify_char: Optional[str] = None
-        self._response_queue: asyncio.Queue = asyncio.Queue()
+        # Resolved characteristic objects, so Bleak doesn't have to look the
+        # UUID up in the service collection on every write
+        self.write_char: Optional[BleakGATTCharacteristic] = None
+        self.notify_char: Optional[BleakGATTCharacteristic] = None
+        # Bounded: once full, appending drops the oldest notification
+        self._responses: deque[bytes] = deque(maxlen=self.MAX_QUEUE_SIZE)
+        self._response_event = asyncio.Event()
         self._notification_callback: Optional[Callable] = None
 
     @staticmethod
@@ -155,44 +180,63 @@ class BLEConnection:
         return None
 
     @classmethod
-    async def scan(cls, timeout: float = 10.0) -> list[PrinterInfo]:
+    async def scan(cls, timeout: float = 10.0, min_rssi: Optional[int] = None) -> list[PrinterInfo]:
         """Scan for P31S printers.
 
         On macOS, attempts to extract real MAC addresses from advertisement
         data since CoreBluetooth returns UUIDs instead of MAC addresses.
+
+        Args:
+            timeout: Scan duration in seconds
+            min_rssi: Skip devices with a weaker signal than this (dBm)
         """
         printers = []
         devices = await BleakScanner.discover(timeout=timeout, return_adv=True)
         is_macos = cls._is_macos()
+        patterns = cls._UPPER_PATTERNS
 
         for device, adv_data in devices.values():
+            # Cheap RSSI check first, before any string work
+            rssi = adv_data.rssi if adv_data.rssi is not None else -100
+            if min_rssi is not None and rssi < min_rssi:
+                continue
+
             name = device.name or adv_data.local_name or ""
-            if any(pattern.upper() in name.upper() for pattern in cls.DEVICE_PATTERNS):
-                mac_address: Optional[str] = None
-
-                if is_macos:
-                    # On macOS, device.address is a UUID, try to extract real MAC
-                    if adv_data.manufacturer_data:
-                        mac_address = cls._extract_mac_from_manufacturer_data(
-                            adv_data.manufacturer_data
-                        )
-                else:
-                    # On Linux/Windows, device.address is already the MAC
-                    mac_address = device.address
-
-                printers.append(
-                    PrinterInfo(
-                        name=name,
-                        address=device.address,
-                        rssi=adv_data.rssi if adv_data.rssi is not None else -100,
-                        mac_address=mac_address,
+            name_upper = name.upper()
+            if not any(pattern in name_upper for pattern in patterns):
+                continue
+
+            mac_address: Optional[str] = None
+            if is_macos:
+                # On macOS, device.address is a UUID, try to extract real MAC
+                if adv_data.manufacturer_data:
+                    mac_address = cls._extract_mac_from_manufacturer_data(
+                        adv_data.manufacturer_data
                     )
+            else:
+                # On Linux/Windows, device.address is already the MAC
+                mac_address = device.address
+
+            printers.append(
+                PrinterInfo(
+                    name=name,
+                    address=device.address,
+                    rssi=rssi,
+                    mac_address=mac_address,
                 )
+            )
 
         return sorted(printers, key=lambda p: p.rssi, reverse=True)
 
     async def connect(self, address: str) -> bool:
         """Connect to a printer by address."""
+        # Start from a clean slate: characteristics and queued responses
+        # from a previous client must not carry over to this one
+        self.write_char = None
+        self.notify_char = None
+        self._responses.clear()
+        self._response_event.clear()
+
         self.client = BleakClient(address)
 
         try:
@@ -201,15 +245,52 @@ class BLEConnection:
             # Discover services and find write/notify characteristics
             await self._discover_characteristics()
 
+            # Learn the negotiated MTU so get_mtu() can size chunks to it
+            await self._acquire_mtu()
+
             # Set up notification handler if we found a notify characteristic
             if self.notify_char:
                 await self.client.start_notify(self.notify_char, self._handle_notification)
 
             return True
         except Exception as e:
-            print(f"Connection failed: {e}")
+            logger.warning("Connection failed: %s", e)
             return False
 
+    @classmethod
+    async def connect_cached(cls, scan_timeout: float = 5.0) -> Optional["BLEConnection"]:
+        """Connect to the last-used printer, scanning only if that fails.
+
+        Tries the cached printer address first. On a cache miss or failed
+        connection, scans, connects to the strongest printer found and saves
+        it to the cache for next time.
+
+        Args:
+            scan_timeout: Scan duration in seconds when the cache can't be used
+
+        Returns:
+            Connected BLEConnection, or None if no printer could be reached
+        """
+        conn = cls()
+
+        cached = load_cached_printer()
+        if cached:
+            if await conn.connect(cached.address):
+                return conn
+            # A failed attempt may leave the client connected (e.g. discovery
+            # failed); close it before reusing the connection
+            await conn.disconnect()
+
+        printers = await cls.scan(timeout=scan_timeout)
+        if not printers:
+            return None
+        if not await conn.connect(printers[0].address):
+            await conn.disconnect()
+            return None
+
+        save_printer(printers[0].address, printers[0].name)
+        return conn
+
     async def disconnect(self):
         """Disconnect from the printer."""
         if self.client and self.client.is_connected:
@@ -228,21 +309,55 @@ class BLEConnection:
         if not self.client:
             return
 
+        # One pass over all services: index characteristics by UUID (first
+        # match wins if several services expose the same one) and note the
+        # first writable and notifiable ones for unknown models
+        by_uuid = {}
+        first_write = None
+        first_notify = None
         for service in self.client.services:
             for char in service.characteristics:
+                by_uuid.setdefault(char.uuid, char)
                 props = char.properties
+                if first_write is None and ("write" in props or "write-without-response" in props):
+                    first_write = char
+                if first_notify is None and ("notify" in props or "indicate" in props):
+                    first_notify = char
+
+        # Prefer the known P31S characteristic pairs
+        for write_uuid, notify_uuid in (
+            (self.CHAR_WRITE, self.CHAR_NOTIFY),
+            (self.ALT_CHAR_WRITE, self.ALT_CHAR_NOTIFY),
+        ):
+            if write_uuid in by_uuid and notify_uuid in by_uuid:
+                self.write_char = by_uuid[write_uuid]
+                self.notify_char = by_uuid[notify_uuid]
+                return
+
+        # Unknown model: take the first writable and notifiable characteristics
+        self.write_char = first_write
+        self.notify_char = first_notify
+        if first_write:
+            logger.debug("Found write characteristic: %s", first_write.uuid)
+        if first_notify:
+            logger.debug("Found notify characteristic: %s", first_notify.uuid)
+
+    async def _acquire_mtu(self):
+        """Fetch the negotiated ATT MTU where the backend doesn't report it.
+
+        BlueZ exchanges the MTU when connecting, but Bleak only learns the
+        value by acquiring a characteristic; until then mtu_size falls back
+        to 23. CoreBluetooth and WinRT report the negotiated MTU directly.
+        """
+        backend = getattr(self.client, "_backend", None)
+        if type(backend).__name__ != "BleakClientBlueZDBus":
+            return
 
-                # Find writable characteristic
-                if "write" in props or "write-without-response" in props:
-                    if not self.write_char:
-                        self.write_char = char.uuid
-                        print(f"Found write characteristic: {char.uuid}")
-
-                # Find notify characteristic
-                if "notify" in props or "indicate" in props:
-                    if not self.notify_char:
-                        self.notify_char = char.uuid
-                        print(f"Found notify characteristic: {char.uuid}")
+        try:
+            await backend._acquire_mtu()
+        except Exception:
+            # Not fatal: get_mtu() falls back to DEFAULT_CHUNK_SIZE
+            pass
 
     def _handle_notification(self, sender: BleakGATTCharacteristic, data: bytearray):
         """Handle incoming notifications from the printer."""
@@ -250,17 +365,17 @@ class BLEConnection:
         if len(data) > self.MAX_RESPONSE_SIZE:
             return
 
-        # Security: if queue is full, drop oldest item to prevent memory exhaustion
-        if self._response_queue.qsize() >= self.MAX_QUEUE_SIZE:
-            try:
-                self._response_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                pass
+        # One immutable copy, shared by the buffer and the callback
+        response = bytes(data)
 
-        self._response_queue.put_nowait(bytes(data))
+        # Security: the deque is bounded, so when full the oldest item is
+        # dropped to prevent memory exhaustion
+        self._responses.append(response)
+        self._response_event.set()
 
-        if self._notification_callback:
-            self._notification_callback(bytes(data))
+        callback = self._notification_callback
+        if callback:
+            callback(response)
 
     def set_notification_callback(self, callback: Callable[[bytes], None]):
         """Set a callback for incoming notifications."""
@@ -280,12 +395,12 @@ class BLEConnection:
             await self.client.write_gatt_char(self.write_char, data, response=response)
             return True
         except Exception as e:
-            print(f"Write failed: {e}")
+            logger.warning("Write failed: %s", e)
             return False
 
     async def write_chunked(
         self,
-        data: bytes,
+        data: Union[bytes, memoryview],
         chunk_size: int = DEFAULT_CHUNK_SIZE,
         delay_ms: float = 10.0,
         response: bool = False,
@@ -293,8 +408,13 @@ class BLEConnection:
         """
         Write data to the printer in chunks.
 
+        With no delay and no write response, chunks are pipelined: up to
+        tx_queue_depth writes are kept in flight instead of awaiting each
+        one before issuing the next.
+
         Args:
-            data: Data to write
+            data: Data to write (a memoryview is sliced without copying the
+                whole buffer; only each chunk is materialized)
             chunk_size: Maximum bytes per chunk (default 20, safe for most BLE)
             delay_ms: Delay between chunks in milliseconds
             response: Whether to wait for write response
@@ -305,24 +425,63 @@ class BLEConnection:
         if not self.client or not self.write_char:
             return False
 
-        total_chunks = (len(data) + chunk_size - 1) // chunk_size
+        view = memoryview(data)
+        if delay_ms <= 0 and not response:
+            return await self._write_pipelined(view, chunk_size)
 
-        for i in range(0, len(data), chunk_size):
-            chunk = data[i : i + chunk_size]
+        total_chunks = (len(view) + chunk_size - 1) // chunk_size
+
+        for i in range(0, len(view), chunk_size):
+            chunk = bytes(view[i : i + chunk_size])
             chunk_num = i // chunk_size + 1
 
             try:
                 await self.client.write_gatt_char(self.write_char, chunk, response=response)
             except Exception as e:
-                print(f"Write failed at chunk {chunk_num}/{total_chunks}: {e}")
+                logger.warning("Write failed at chunk %d/%d: %s", chunk_num, total_chunks, e)
                 return False
 
             # Small delay between chunks to avoid overwhelming the printer
-            if delay_ms > 0 and i + chunk_size < len(data):
+            if delay_ms > 0 and i + chunk_size < len(view):
                 await asyncio.sleep(delay_ms / 1000.0)
 
         return True
 
+    async def _write_pipelined(self, view: memoryview, chunk_size: int) -> bool:
+        """Write chunks without response, keeping at most tx_queue_depth in flight.
+
+        Chunks are sliced and issued in order by a producer loop that, once
+        the window is full, waits for a write to finish before starting the
+        next. How long a write-without-response takes to finish is up to the
+        Bleak backend, so this bounds the queue but is no substitute for
+        delay_ms pacing on backends that return immediately. On failure the
+        outstanding writes are cancelled and drained.
+        """
+        pending: set[asyncio.Task] = set()
+        try:
+            for i in range(0, len(view), chunk_size):
+                if len(pending) >= self.tx_queue_depth:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    _raise_first_error(done)
+                chunk = bytes(view[i : i + chunk_size])
+                pending.add(
+                    asyncio.create_task(
+                        self.client.write_gatt_char(self.write_char, chunk, response=False)
+                    )
+                )
+            if pending:
+                done, pending = await asyncio.wait(pending)
+                _raise_first_error(done)
+            return True
+        except Exception as e:
+            logger.warning("Write failed: %s", e)
+            return False
+        finally:
+            for task in pending:
+                task.cancel()
+            # Retrieve every outcome so no task exception goes unobserved
+            await asyncio.gather(*pending, return_exceptions=True)
+
     async def get_mtu(self) -> int:
         """Get the negotiated MTU size."""
         if not self.client:
@@ -341,10 +500,72 @@ class BLEConnection:
 
     async def read_response(self, timeout: float = 5.0) -> Optional[bytes]:
         """Wait for and return a response from the printer."""
-        try:
-            return await asyncio.wait_for(self._response_queue.get(), timeout=timeout)
-        except asyncio.TimeoutError:
-            return None
+        # Several readers can wake on one notification; whoever finds the
+        # buffer empty again goes back to waiting until the shared deadline
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self._responses:
+            self._response_event.clear()
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._response_event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return None
+
+        response = self._responses.popleft()
+        if not self._responses:
+            self._response_event.clear()
+        return response
+
+    async def wait_idle(self, poll_interval: float = 0.25, response_timeout: float = 1.0) -> bool:
+        """
+        Wait until the printer reports that it is idle.
+
+        Polls the TSPL status query (ESC ! ?) until the printer answers
+        with the idle status byte. Responses already queued (e.g. a late
+        CONFIG? or BATTERY? reply) are discarded before each poll, and
+        replies that are not a single status byte are skipped, so they are
+        never mistaken for the status. Wrap in asyncio.wait_for() to bound
+        the total wait.
+
+        Args:
+            poll_interval: Delay between status polls in seconds
+            response_timeout: Time to wait for each status reply in seconds
+
+        Returns:
+            True once the printer reports idle, False if the status query
+            could not be sent or went unanswered
+        """
+        while True:
+            self._responses.clear()
+            self._response_event.clear()
+
+            if not await self.write(self.STATUS_QUERY):
+                return False
+
+            status = await self._read_status(response_timeout)
+            if status is None:
+                return False
+            if status == self.STATUS_IDLE:
+                return True
+
+            await asyncio.sleep(poll_interval)
+
+    async def _read_status(self, timeout: float) -> Optional[int]:
+        """Read the one-byte ESC ! ? reply, skipping any other responses."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (remaining := deadline - loop.time()) > 0:
+            response = await self.read_response(timeout=remaining)
+            if response is None:
+                return None
+            if response.endswith(b"\r\n"):
+                response = response[:-2]
+            if len(response) == 1:
+                return response[0]
+        return None
 
     async def get_services(self) -> list[ServiceInfo]:
         """Get all services and characteristics (for discovery)."""
@@ -370,3 +591,11 @@ class BLEConnection:
     def is_connected(self) -> bool:
         """Check if currently connected."""
         return self.client is not None and self.client.is_connected
+
+
+def _raise_first_error(tasks: set[asyncio.Task]) -> None:
+    """Raise the first exception among finished tasks, retrieving all of them."""
+    errors = [task.exception() for task in tasks if not task.cancelled()]
+    for error in errors:
+        if error is not None:
+            raise error
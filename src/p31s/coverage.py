@@ -4,7 +4,7 @@ Coverage test pattern generator for P31S label printer.
 Generates test patterns to validate print area boundaries.
 """
 
-from PIL import Image, ImageDraw
+from PIL import Image
 
 
 def generate_coverage_pattern(
@@ -31,15 +31,25 @@ def generate_coverage_pattern(
     Returns:
         PIL Image with 1-bit test pattern (mode "1")
     """
-    img = Image.new("1", (width, height), color=1)  # White background
-    draw = ImageDraw.Draw(img)
+    # Paint everything into a one-byte-per-pixel "L" mask (255 = black) with
+    # slice assignments, then apply it to the image in a single paste
+    mask = bytearray(width * height)
+
+    def fill(x0: int, y0: int, x1: int, y1: int) -> None:
+        """Mark the box [x0, x1) x [y0, y1) black, clipped to the image."""
+        x0, x1 = max(x0, 0), min(x1, width)
+        y0, y1 = max(y0, 0), min(y1, height)
+        if x0 >= x1:
+            return
+        run = b"\xff" * (x1 - x0)
+        for y in range(y0, y1):
+            mask[y * width + x0 : y * width + x1] = run
 
     # Draw border rectangle
-    draw.rectangle(
-        [0, 0, width - 1, height - 1],
-        outline=0,
-        width=border_width,
-    )
+    fill(0, 0, width, border_width)
+    fill(0, height - border_width, width, height)
+    fill(0, 0, border_width, height)
+    fill(width - border_width, 0, width, height)
 
     # Draw corner markers (small filled squares)
     corner_size = 8
@@ -50,39 +60,30 @@ def generate_coverage_pattern(
         (width - corner_size, height - corner_size),  # Bottom-right
     ]
     for cx, cy in corners:
-        draw.rectangle([cx, cy, cx + corner_size - 1, cy + corner_size - 1], fill=0)
+        fill(cx, cy, cx + corner_size, cy + corner_size)
 
     # Draw center crosshair
     center_x, center_y = width // 2, height // 2
     crosshair_size = 10
     # Horizontal line
-    draw.line(
-        [(center_x - crosshair_size, center_y), (center_x + crosshair_size, center_y)],
-        fill=0,
-        width=1,
-    )
+    fill(center_x - crosshair_size, center_y, center_x + crosshair_size + 1, center_y + 1)
     # Vertical line
-    draw.line(
-        [(center_x, center_y - crosshair_size), (center_x, center_y + crosshair_size)],
-        fill=0,
-        width=1,
-    )
+    fill(center_x, center_y - crosshair_size, center_x + 1, center_y + crosshair_size + 1)
 
     # Draw grid tick marks along edges
     tick_length = 4
-
-    # Horizontal ticks (along top and bottom)
-    for x in range(grid_spacing, width, grid_spacing):
-        # Top edge
-        draw.line([(x, 0), (x, tick_length)], fill=0)
-        # Bottom edge
-        draw.line([(x, height - tick_length - 1), (x, height - 1)], fill=0)
-
+    tick_depth = tick_length + 1  # Ticks cover both endpoints
+    # Horizontal ticks (along top and bottom): every spacing-th pixel of a row
+    top_ticks = len(range(grid_spacing, width, grid_spacing))
+    for y in [*range(tick_depth), *range(height - tick_depth, height)]:
+        if 0 <= y < height:
+            row = y * width
+            mask[row + grid_spacing : row + width : grid_spacing] = b"\xff" * top_ticks
     # Vertical ticks (along left and right)
     for y in range(grid_spacing, height, grid_spacing):
-        # Left edge
-        draw.line([(0, y), (tick_length, y)], fill=0)
-        # Right edge
-        draw.line([(width - tick_length - 1, y), (width - 1, y)], fill=0)
+        fill(0, y, tick_depth, y + 1)
+        fill(width - tick_depth, y, width, y + 1)
 
+    img = Image.new("1", (width, height), color=1)  # White background
+    img.paste(0, (0, 0), Image.frombytes("L", (width, height), bytes(mask)))
     return img
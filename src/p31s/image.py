@@ -16,6 +16,13 @@ from PIL import Image
 MAX_IMAGE_DIMENSION = 10000  # Maximum width or height in pixels
 MAX_IMAGE_PIXELS = 10_000_000  # Maximum total pixels (10 megapixels)
 
+# Byte lookup table flipping every bit: PIL "1" mode packs white as 1,
+# the printer wants black (burn) as 1
+_INVERT_TABLE = bytes(255 - b for b in range(256))
+
+# Byte lookup tables clearing the low n bits (row padding), indexed by n
+_PAD_CLEAR_TABLES = [bytes(b & (0xFF << n) & 0xFF for b in range(256)) for n in range(8)]
+
 
 class ImageSizeError(ValueError):
     """Image dimensions exceed safety limits."""
@@ -96,7 +103,7 @@ class ImageProcessor:
 
         # Rotate if requested
         if rotate:
-            image = image.rotate(90, expand=True)
+            image = image.transpose(Image.Transpose.ROTATE_90)
 
         # Resize to fit printer width while maintaining aspect ratio
         if image.width != self.width:
@@ -110,20 +117,21 @@ class ImageProcessor:
 
         return image
 
-    def _get_pixels(self, image: Image.Image) -> list:
-        """Get pixel data from image without using deprecated methods."""
-        if image.mode != "1":
-            image = image.convert("1")
-
-        width = image.width
-        height = image.height
-        pixels = []
+    @staticmethod
+    def _pack_black(image: Image.Image) -> bytearray:
+        """Pack a "1" mode image MSB-first with black = 1 and zero row padding."""
+        # tobytes() already packs MSB-first with rows padded to whole bytes;
+        # only the polarity differs, which one translate() pass flips
+        data = bytearray(image.tobytes().translate(_INVERT_TABLE))
 
-        for y in range(height):
-            for x in range(width):
-                pixels.append(image.getpixel((x, y)))
+        # Inverting also set the padding bits; clear them in each row's last byte
+        spare_bits = -image.width % 8
+        if spare_bits:
+            bytes_per_row = (image.width + 7) // 8
+            last = slice(bytes_per_row - 1, None, bytes_per_row)
+            data[last] = data[last].translate(_PAD_CLEAR_TABLES[spare_bits])
 
-        return pixels
+        return data
 
     def to_bytes(self, image: Image.Image) -> bytes:
         """
@@ -135,40 +143,7 @@ class ImageProcessor:
         if image.mode != "1":
             image = image.convert("1")
 
-        width = image.width
-        height = image.height
-
-        # Calculate bytes per row (rounded up to nearest byte)
-        bytes_per_row = (width + 7) // 8
-
-        result = bytearray()
-
-        for row in range(height):
-            row_byte = 0
-            bit_pos = 7
-
-            for col in range(width):
-                pixel = image.getpixel((col, row))
-                # In PIL "1" mode, 0 is black, 255 is white
-                # For thermal printer: 1 = burn (black), 0 = no burn (white)
-                if pixel == 0:  # Black pixel
-                    row_byte |= 1 << bit_pos
-
-                bit_pos -= 1
-                if bit_pos < 0:
-                    result.append(row_byte)
-                    row_byte = 0
-                    bit_pos = 7
-
-            # Pad last byte of row if needed
-            if bit_pos != 7:
-                result.append(row_byte)
-
-            # Pad row to full byte width if needed
-            while len(result) % bytes_per_row != 0 or len(result) == 0:
-                result.append(0)
-
-        return bytes(result)
+        return bytes(self._pack_black(image))
 
     def iter_rows(self, image: Image.Image) -> Iterator[bytes]:
         """
@@ -179,35 +154,11 @@ class ImageProcessor:
         if image.mode != "1":
             image = image.convert("1")
 
-        width = image.width
-        height = image.height
-        bytes_per_row = (width + 7) // 8
-
-        for row in range(height):
-            row_bytes = bytearray()
-            row_byte = 0
-            bit_pos = 7
-
-            for col in range(width):
-                pixel = image.getpixel((col, row))
-                if pixel == 0:  # Black pixel
-                    row_byte |= 1 << bit_pos
-
-                bit_pos -= 1
-                if bit_pos < 0:
-                    row_bytes.append(row_byte)
-                    row_byte = 0
-                    bit_pos = 7
-
-            # Handle partial last byte
-            if bit_pos != 7:
-                row_bytes.append(row_byte)
-
-            # Pad to full width
-            while len(row_bytes) < bytes_per_row:
-                row_bytes.append(0)
+        data = self._pack_black(image)
+        bytes_per_row = (image.width + 7) // 8
 
-            yield bytes(row_bytes)
+        for offset in range(0, len(data), bytes_per_row):
+            yield bytes(data[offset : offset + bytes_per_row])
 
     def count_empty_rows(self, rows: list[bytes]) -> list[tuple]:
         """
@@ -90,6 +90,7 @@ class P31SPrinter:
         label_width_mm: float = DEFAULT_LABEL_WIDTH_MM,
         label_height_mm: float = DEFAULT_LABEL_HEIGHT_MM,
         gap_mm: float = DEFAULT_GAP_MM,
+        chunk_delay_ms: float = 10.0,
     ):
         """
         Initialize printer interface.
@@ -98,9 +99,14 @@ class P31SPrinter:
             label_width_mm: Label width in millimeters (default 15mm per iOS capture)
             label_height_mm: Label height in millimeters (default 40mm)
             gap_mm: Gap between labels in millimeters (default 5mm per iOS capture)
+            chunk_delay_ms: Delay between print job chunks in milliseconds
+                (default 10 to avoid overwhelming the printer). 0 opts in to
+                pipelined writes with up to tx_queue_depth in flight, not yet
+                verified on hardware; the CLI exposes it as --chunk-delay.
         """
         self.connection = BLEConnection()
         self.label_size = LabelSize(label_width_mm, label_height_mm, gap_mm)
+        self.chunk_delay_ms = chunk_delay_ms
         self._debug = False
 
     def set_debug(self, enabled: bool):
@@ -301,7 +307,8 @@ class P31SPrinter:
         cmd.bitmap_from_image(x, y, img, mode=BitmapMode.OR, dither_black=True)
         cmd.print_label(1, copies)
 
-        job_data = cmd.get_commands()
+        # Sent straight from the command buffer, without copying the job
+        job_data = cmd.get_view()
         self._log(f"Print job size: {len(job_data)} bytes")
 
         # Send with retry logic
@@ -321,7 +328,9 @@ class P31SPrinter:
                 mtu = await self.connection.get_mtu()
                 self._log(f"Sending with chunk size: {mtu} bytes")
 
-                success = await self.connection.write_chunked(job_data, chunk_size=mtu)
+                success = await self.connection.write_chunked(
+                    job_data, chunk_size=mtu, delay_ms=self.chunk_delay_ms
+                )
 
                 if success:
                     self._log("Print job sent successfully")
@@ -360,13 +369,12 @@ class P31SPrinter:
         # Create a checkerboard pattern that works with thermal protection
         width = 64
         height = 64
-        img = Image.new("1", (width, height), color=1)  # White background
 
-        # Draw checkerboard
-        for y in range(height):
-            for x in range(width):
-                if (x // 8 + y // 8) % 2 == 0:
-                    img.putpixel((x, y), 0)  # Black
+        # Draw checkerboard. 8px cells are whole bytes in "1" mode (MSB first,
+        # 1 = white), so each band of 8 rows repeats one byte pattern
+        black_first = b"\x00\xff" * (width // 16) * 8
+        white_first = b"\xff\x00" * (width // 16) * 8
+        img = Image.frombytes("1", (width, height), (black_first + white_first) * (height // 16))
 
         return await self.print_image(img, retries=retries)
 
@@ -390,10 +398,12 @@ class P31SPrinter:
 
         Useful for protocol testing.
         """
-        self._log(f"TX: {data.hex() if len(data) < 50 else data[:50].hex() + '...'}")
+        # Only hex-format the traffic when it will actually be shown
+        if self._debug:
+            self._log(f"TX: {data.hex() if len(data) < 50 else data[:50].hex() + '...'}")
         await self.connection.write(data)
         response = await self.connection.read_response(timeout=2.0)
-        if response:
+        if response and self._debug:
             self._log(f"RX: {response.hex()}")
         return response
 
@@ -6,9 +6,22 @@ This module parses responses from the text-based status commands
 from the decompiled Labelnize APK.
 """
 
+import re
+import struct
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
+# CONFIG? payload after the 7-byte "CONFIG " header: padding, resolution,
+# padding, hardware version, firmware version, settings
+_CONFIG_PAYLOAD = struct.Struct("xBx3s3sB")
+
+# BATTERY? payload after the 8-byte "BATTERY " header: BCD level, charging
+_BATTERY_PAYLOAD = struct.Struct("BB")
+
+# First run of ASCII digits in a numeric response, matched on the raw bytes
+_NUMBER_RE = re.compile(rb"\d+")
+
 
 @dataclass
 class PrinterConfig:
@@ -46,40 +59,24 @@ class PrinterConfig:
         Returns:
             PrinterConfig instance or None if parsing fails
         """
-        # Strip CRLF terminator if present
-        if data.endswith(b"\r\n"):
-            data = data[:-2]
-
-        # Verify header starts with "CONFIG"
-        if not data.startswith(b"CONFIG"):
-            return None
-
-        # Response should be 17 bytes after stripping CRLF
-        if len(data) < 17:
-            return None
-
-        # Skip 7-byte header "CONFIG "
-        payload = data[7:]
+        # Parse up to the CRLF terminator, if present, without slicing it off
+        end = _payload_end(data)
 
-        if len(payload) < 10:
+        # Verify the 7-byte header "CONFIG " (with space) in one prefix check;
+        # response should be 17 bytes after stripping CRLF
+        if end < 17 or not data.startswith(b"CONFIG "):
             return None
 
-        # Parse resolution (single byte at offset 1, after padding byte)
+        # Unpack the payload after the 7-byte header "CONFIG " in one call:
         # payload[0] = padding (0x00)
         # payload[1] = resolution (e.g., 203)
         # payload[2] = padding (0x00)
-        resolution = payload[1]
+        # payload[3:6] = hardware version, payload[6:9] = firmware version
+        # payload[9] = settings byte
+        resolution, hw_bytes, fw_bytes, settings = _CONFIG_PAYLOAD.unpack_from(data, 7)
+        hardware_version = hw_bytes.hex()
+        firmware_version = fw_bytes.hex()
 
-        # Parse hardware version (3 bytes at offset 3)
-        hw_bytes = payload[3:6]
-        hardware_version = _bytes_to_version(hw_bytes)
-
-        # Parse firmware version (3 bytes at offset 6)
-        fw_bytes = payload[6:9]
-        firmware_version = _bytes_to_version(fw_bytes)
-
-        # Parse settings byte at offset 9
-        settings = payload[9] if len(payload) > 9 else 0
         shutdown_timer = settings  # May need further decoding
         sound_enabled = False  # May be encoded in settings byte
 
@@ -90,7 +87,7 @@ class PrinterConfig:
             shutdown_timer=shutdown_timer,
             sound_enabled=sound_enabled,
             config_version=None,
-            raw_data=data,
+            raw_data=data[:end],
         )
 
     def firmware_version_display(self) -> str:
@@ -142,25 +139,22 @@ class BatteryStatus:
         Returns:
             BatteryStatus instance or None if parsing fails
         """
-        # Strip CRLF terminator if present
-        if data.endswith(b"\r\n"):
-            data = data[:-2]
+        # Parse up to the CRLF terminator, if present, without slicing it off
+        end = _payload_end(data)
 
         # Validate header - note it's "BATTERY " with trailing space (8 bytes)
-        if len(data) < 10 or not data.startswith(b"BATTERY"):
+        if end < 10 or not data.startswith(b"BATTERY "):
             return None
 
         # Header is 8 bytes "BATTERY " (with space)
         # Byte 8: battery level (BCD)
         # Byte 9: charging status
-        level_bcd = data[8]
-        level = _decode_bcd(level_bcd)
-        charging = bool(data[9])
+        level_bcd, charging = _BATTERY_PAYLOAD.unpack_from(data, 8)
 
         return cls(
-            level=level,
-            charging=charging,
-            raw_data=data,
+            level=_BCD_TABLE[level_bcd],
+            charging=charging != 0,
+            raw_data=data[:end],
         )
 
     def __str__(self) -> str:
@@ -178,22 +172,17 @@ class ChunkSize:
     @classmethod
     def parse(cls, data: bytes) -> Optional["ChunkSize"]:
         """Parse GETCHUNKSIZE response."""
-        # Strip CRLF
-        if data.endswith(b"\r\n"):
-            data = data[:-2]
-
-        # Try to parse as integer
-        try:
-            # Response may be just a number, or prefixed
-            text = data.decode("ascii").strip()
-            # Try to extract number from response
-            import re
-
-            match = re.search(r"\d+", text)
-            if match:
-                return cls(size=int(match.group()), raw_data=data)
-        except (ValueError, UnicodeDecodeError):
-            pass
+        # Non-ASCII bytes mean a garbled reply, not a number
+        if not data.isascii():
+            return None
+
+        # Parse up to the CRLF terminator, if present, without slicing it off
+        end = _payload_end(data)
+
+        # Response may be just a number, or prefixed
+        match = _NUMBER_RE.search(data, 0, end)
+        if match:
+            return cls(size=int(match.group()), raw_data=data[:end])
 
         return None
 
@@ -208,28 +197,26 @@ class PrintedCount:
     @classmethod
     def parse(cls, data: bytes) -> Optional["PrintedCount"]:
         """Parse GETPRINTEDCOUNT response."""
-        # Strip CRLF
-        if data.endswith(b"\r\n"):
-            data = data[:-2]
+        # Non-ASCII bytes mean a garbled reply, not a number
+        if not data.isascii():
+            return None
 
-        try:
-            text = data.decode("ascii").strip()
-            import re
+        # Parse up to the CRLF terminator, if present, without slicing it off
+        end = _payload_end(data)
 
-            match = re.search(r"\d+", text)
-            if match:
-                return cls(count=int(match.group()), raw_data=data)
-        except (ValueError, UnicodeDecodeError):
-            pass
+        match = _NUMBER_RE.search(data, 0, end)
+        if match:
+            return cls(count=int(match.group()), raw_data=data[:end])
 
         return None
 
 
-def _bytes_to_version(data: bytes) -> str:
-    """Convert 3 bytes to hex version string (e.g., '010203')."""
-    return "".join(f"{b:02x}" for b in data)
+def _payload_end(data: bytes) -> int:
+    """Return the length of a response without its CRLF terminator."""
+    return len(data) - 2 if data.endswith(b"\r\n") else len(data)
 
 
+@lru_cache(maxsize=32)
 def _hex_version_to_display(hex_version: str) -> str:
     """Convert hex version string to display format (e.g., '010203' -> '1.2.3')."""
     if len(hex_version) == 6:
@@ -240,6 +227,10 @@ def _hex_version_to_display(hex_version: str) -> str:
     return hex_version
 
 
+# Decoded value of every byte, so _decode_bcd is a single index
+_BCD_TABLE = bytes((b >> 4) * 10 + (b & 0x0F) for b in range(256))
+
+
 def _decode_bcd(value: int) -> int:
     """
     Decode BCD (Binary-Coded Decimal) to integer.
@@ -247,6 +238,4 @@ def _decode_bcd(value: int) -> int:
     BCD encodes each decimal digit in 4 bits.
     For example: 0x99 = 99 decimal, 0x50 = 50 decimal
     """
-    high = (value >> 4) & 0x0F
-    low = value & 0x0F
-    return high * 10 + low
+    return _BCD_TABLE[value]
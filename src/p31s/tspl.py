@@ -9,9 +9,26 @@ Reference: TSPL/TSPL2 Programming Manual
 
 from dataclasses import dataclass
 from enum import IntEnum
+from functools import lru_cache
 
 from PIL import Image
 
+# Byte lookup table for _dither_solid_black: 0x00 becomes 0x08, all else as-is
+_DITHER_TABLE = bytes([0x08]) + bytes(range(1, 256))
+
+# Parameter-free commands, pre-encoded with their CRLF
+_CLS = b"CLS\r\n"
+_HOME = b"HOME\r\n"
+_FORMFEED = b"FORMFEED\r\n"
+_SELFTEST = b"SELFTEST\r\n"
+
+# Status query, ESC ! ? (sent without CRLF)
+_QUERY_STATUS = b"\x1b!?"
+
+# Byte lookup tables setting the low n bits (row padding) to 1 (white),
+# indexed by n, for bitmap_from_image
+_PAD_WHITE_TABLES = [bytes(b | ((1 << n) - 1) for b in range(256)) for n in range(8)]
+
 
 class Density(IntEnum):
     """Print density levels (0-15)."""
@@ -70,7 +87,9 @@ class TSPLCommand:
     CRLF = b"\r\n"
 
     def __init__(self):
-        self._commands: list[bytes] = []
+        # One growing buffer; commands are appended in place, so large
+        # bitmap payloads aren't kept as separate objects and joined later
+        self._commands = bytearray()
 
     def clear(self):
         """Clear all queued commands."""
@@ -78,15 +97,25 @@ class TSPLCommand:
 
     def get_commands(self) -> bytes:
         """Get all commands as a single byte string."""
-        return b"".join(self._commands)
+        return bytes(self._commands)
+
+    def get_view(self) -> memoryview:
+        """
+        Get a zero-copy view of all commands.
+
+        Saves copying the whole job when it is only going to be sent.
+        While the view is alive the buffer can't be resized, so release
+        it before adding more commands or calling clear().
+        """
+        return memoryview(self._commands)
 
     def _add(self, cmd: str):
         """Add a command string."""
-        self._commands.append(cmd.encode("utf-8") + self.CRLF)
+        self._commands += _encode_command(cmd)
 
     def _add_raw(self, data: bytes):
         """Add raw bytes."""
-        self._commands.append(data)
+        self._commands += data
 
     # ---- Setup Commands ----
 
@@ -126,15 +155,15 @@ class TSPLCommand:
 
     def cls(self):
         """Clear the image buffer."""
-        self._add("CLS")
+        self._add_raw(_CLS)
 
     def home(self):
         """Feed label to home position."""
-        self._add("HOME")
+        self._add_raw(_HOME)
 
     def formfeed(self):
         """Feed one label forward."""
-        self._add("FORMFEED")
+        self._add_raw(_FORMFEED)
 
     def feed(self, dots: int):
         """Feed paper by specified dots."""
@@ -240,8 +269,8 @@ class TSPLCommand:
             mode: Overlay mode (0=overwrite, 1=OR, 2=XOR)
             data: Raw bitmap bytes (1 bit per pixel, MSB first)
         """
-        cmd = f"BITMAP {x},{y},{width_bytes},{height},{int(mode)},"
-        self._add_raw(cmd.encode("utf-8"))
+        # bytes %-formatting yields the header without a separate encode step
+        self._add_raw(b"BITMAP %d,%d,%d,%d,%d," % (x, y, width_bytes, height, mode))
         self._add_raw(data)
         self._add_raw(self.CRLF)
 
@@ -269,49 +298,15 @@ class TSPLCommand:
         if image.mode != "1":
             image = image.convert("1")
 
-        width = image.width
-        height = image.height
-        width_bytes = (width + 7) // 8
-
-        # Convert image to TSPL bitmap format
-        # TSPL: 0 = black, 1 = white (opposite of some other formats)
-        data = bytearray()
-
-        for y_pos in range(height):
-            row_byte = 0
-            bit_pos = 7
-
-            for x_pos in range(width):
-                pixel = image.getpixel((x_pos, y_pos))
-                # PIL 1-bit: 0=black, 255=white
-                # TSPL: 0=black (print), 1=white (no print)
-                # So we use the pixel value directly (0 stays 0, 255 becomes 1)
-                if pixel != 0:
-                    row_byte |= 1 << bit_pos
-
-                bit_pos -= 1
-                if bit_pos < 0:
-                    data.append(row_byte)
-                    row_byte = 0
-                    bit_pos = 7
-
-            # Pad last byte if needed (fill unused bits with white)
-            if bit_pos != 7:
-                # Set remaining bits to 1 (white) to avoid black padding
-                mask = (1 << (bit_pos + 1)) - 1
-                row_byte |= mask
-                data.append(row_byte)
-
-            # Ensure row is full width
-            while len(data) % width_bytes != 0:
-                data.append(0xFF)  # Pad with white
+        width_bytes = (image.width + 7) // 8
+        data = _image_to_packed(image)
 
         # Apply dithering to bypass thermal protection
         # The P31S rejects bitmaps that are entirely 0x00 (solid black)
         if dither_black:
             data = self._dither_solid_black(data)
 
-        self.bitmap(x, y, width_bytes, height, mode, bytes(data))
+        self.bitmap(x, y, width_bytes, image.height, mode, data)
 
     @staticmethod
     def _dither_solid_black(data: bytearray) -> bytearray:
@@ -323,9 +318,8 @@ class TSPLCommand:
         while maintaining near-black appearance.
         """
         result = bytearray(data)
-        for i in range(len(result)):
-            if result[i] == 0x00 and i % 4 == 0:
-                result[i] = 0x08  # One white pixel (bit 3)
+        # Every 4th byte: 0x00 -> 0x08 (one white pixel, bit 3), others as-is
+        result[::4] = result[::4].translate(_DITHER_TABLE)
         return result
 
     # ---- Print Commands ----
@@ -344,12 +338,11 @@ class TSPLCommand:
 
     def query_status(self):
         """Query printer status."""
-        # Send ESC ! ? sequence
-        self._add_raw(bytes([0x1B, 0x21, 0x3F]))
+        self._add_raw(_QUERY_STATUS)
 
     def selftest(self):
         """Print self-test page."""
-        self._add("SELFTEST")
+        self._add_raw(_SELFTEST)
 
     # ---- Convenience Methods ----
 
@@ -364,11 +357,7 @@ class TSPLCommand:
             label: Label dimensions
             density: Print density
         """
-        self.size(label.width, label.height)
-        self.gap(label.gap)
-        self.direction(Direction.FORWARD, 0)
-        self.density(density)
-        self.cls()
+        self._add_raw(_label_setup(label.width, label.height, label.gap, int(density)))
 
     def print_image(self, image: Image.Image, x: int = 0, y: int = 0, copies: int = 1):
         """
@@ -383,6 +372,47 @@ class TSPLCommand:
         self.print_label(1, copies)
 
 
+def _image_to_packed(image: Image.Image) -> bytearray:
+    """
+    Pack a "1" mode image into a TSPL bitmap in one contiguous buffer.
+
+    Rows are (width + 7) // 8 bytes each, MSB first, 0 = black and
+    1 = white, so callers can slice rows straight out of the buffer.
+    """
+    # TSPL uses the same layout PIL uses for "1" mode, so tobytes() is
+    # already the bitmap
+    data = bytearray(image.tobytes())
+
+    # PIL pads each row's last byte with 0 (black); set the unused bits
+    # to 1 (white) to avoid black padding
+    spare_bits = -image.width % 8
+    if spare_bits:
+        width_bytes = (image.width + 7) // 8
+        last = slice(width_bytes - 1, None, width_bytes)
+        data[last] = data[last].translate(_PAD_WHITE_TABLES[spare_bits])
+
+    return data
+
+
+@lru_cache(maxsize=256)
+def _encode_command(cmd: str) -> bytes:
+    """Encode a command line with its CRLF, cached since jobs repeat most lines."""
+    return cmd.encode("utf-8") + TSPLCommand.CRLF
+
+
+# typed=True: 15 and 15.0 hash alike but format differently ("15" vs "15.0")
+@lru_cache(maxsize=32, typed=True)
+def _label_setup(width: float, height: float, gap: float, density: int) -> bytes:
+    """Build the setup_label sequence once per label geometry and density."""
+    cmd = TSPLCommand()
+    cmd.size(width, height)
+    cmd.gap(gap)
+    cmd.direction(Direction.FORWARD, 0)
+    cmd.density(density)
+    cmd.cls()
+    return cmd.get_commands()
+
+
 def create_print_job(
     label: LabelSize, image: Image.Image, density: Density = Density.LEVEL_8, copies: int = 1
 ) -> bytes:
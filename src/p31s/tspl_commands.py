@@ -13,6 +13,7 @@ Command Sources:
 """
 
 from enum import IntEnum
+from functools import lru_cache
 
 
 class CommandType(IntEnum):
@@ -58,7 +59,7 @@ class TSPLCommands:
 
         Response: 19 or 20 bytes (see responses.PrinterConfig.parse)
         """
-        return b"CONFIG?" + TSPLCommands.CRLF
+        return b"CONFIG?\r\n"
 
     @staticmethod
     def battery_query() -> bytes:
@@ -69,7 +70,7 @@ class TSPLCommands:
 
         Response: 11 or 12 bytes (see responses.BatteryStatus.parse)
         """
-        return b"BATTERY?" + TSPLCommands.CRLF
+        return b"BATTERY?\r\n"
 
     @staticmethod
     def selftest() -> bytes:
@@ -78,7 +79,7 @@ class TSPLCommands:
 
         Prints a test page with device info and patterns.
         """
-        return b"SELFTEST" + TSPLCommands.CRLF
+        return b"SELFTEST\r\n"
 
     @staticmethod
     def initialize() -> bytes:
@@ -87,7 +88,7 @@ class TSPLCommands:
 
         Should be called after connecting to reset printer state.
         """
-        return b"INITIALPRINTER" + TSPLCommands.CRLF
+        return b"INITIALPRINTER\r\n"
 
     @staticmethod
     def get_chunk_size() -> bytes:
@@ -97,7 +98,7 @@ class TSPLCommands:
         Returns the maximum number of bytes that can be sent
         in a single write operation.
         """
-        return b"GETCHUNKSIZE" + TSPLCommands.CRLF
+        return b"GETCHUNKSIZE\r\n"
 
     @staticmethod
     def get_printed_count() -> bytes:
@@ -106,11 +107,15 @@ class TSPLCommands:
 
         Returns the number of labels/pages printed by this device.
         """
-        return b"GETPRINTEDCOUNT" + TSPLCommands.CRLF
+        return b"GETPRINTEDCOUNT\r\n"
 
     # ========== Print Commands (from LabelCommand.java) ==========
+    # Parameterised commands are cached per argument tuple, since print jobs
+    # repeat the same label size, gap and density. typed=True because 15 and
+    # 15.0 hash alike but format differently ("15" vs "15.0").
 
     @staticmethod
+    @lru_cache(maxsize=64, typed=True)
     def size(width_mm: float, height_mm: float) -> bytes:
         """
         Set label size.
@@ -122,6 +127,7 @@ class TSPLCommands:
         return f"SIZE {width_mm} mm,{height_mm} mm\r\n".encode("ascii")
 
     @staticmethod
+    @lru_cache(maxsize=64, typed=True)
     def gap(gap_mm: float, offset_mm: float = 0) -> bytes:
         """
         Set gap between labels.
@@ -133,6 +139,7 @@ class TSPLCommands:
         return f"GAP {gap_mm} mm,{offset_mm} mm\r\n".encode("ascii")
 
     @staticmethod
+    @lru_cache(maxsize=64, typed=True)
     def direction(direction: int = 0, mirror: int = 0) -> bytes:
         """
         Set print direction and mirroring.
@@ -144,6 +151,7 @@ class TSPLCommands:
         return f"DIRECTION {direction},{mirror}\r\n".encode("ascii")
 
     @staticmethod
+    @lru_cache(maxsize=64, typed=True)
     def density(level: int) -> bytes:
         """
         Set print density/darkness.
@@ -159,6 +167,7 @@ class TSPLCommands:
         return b"CLS\r\n"
 
     @staticmethod
+    @lru_cache(maxsize=64, typed=True)
     def print_label(copies: int = 1, sets: int = 1) -> bytes:
         """
         Execute print command.
@@ -188,10 +197,11 @@ class TSPLCommands:
         For TSPL: 0 = black (burn), 1 = white (no burn)
         Width is rounded up to next byte boundary.
         """
-        cmd = f"BITMAP {x},{y},{width_bytes},{height},{mode},".encode("ascii")
-        return cmd + data + b"\r\n"
+        header = b"BITMAP %d,%d,%d,%d,%d," % (x, y, width_bytes, height, mode)
+        return b"".join((header, data, b"\r\n"))
 
     @staticmethod
+    @lru_cache(maxsize=64, typed=True)
     def bar(x: int, y: int, width: int, height: int) -> bytes:
         """
         Draw a filled black rectangle.
@@ -249,9 +259,13 @@ class TSPLCommands:
         if density >= 0:
             commands.append(TSPLCommands.density(density))
         commands.append(TSPLCommands.cls())
+        # BITMAP header and data go in as separate parts (same bytes as
+        # TSPLCommands.bitmap) so the bitmap is only copied by the final join
         commands.append(
-            TSPLCommands.bitmap(x, y, bitmap_width_bytes, bitmap_height, bitmap_mode, bitmap_data)
+            b"BITMAP %d,%d,%d,%d,%d," % (x, y, bitmap_width_bytes, bitmap_height, bitmap_mode)
         )
+        commands.append(bitmap_data)
+        commands.append(TSPLCommands.CRLF)
         commands.append(TSPLCommands.print_label(copies))
         # Note: Some printers may need FORMFEED to advance to next label
         # Uncomment if label doesn't advance after printing:
@@ -20,6 +20,12 @@ def pytest_addoption(parser):
     )
 
 
+@pytest.fixture(autouse=True)
+def isolated_scan_cache(tmp_path, monkeypatch):
+    """Keep scan results saved by one test out of the next one."""
+    monkeypatch.setattr("p31s.cache.SCAN_CACHE_FILE", tmp_path / "last_scan")
+
+
 @pytest.fixture
 def printer_address(request):
     """Get the printer address from command line."""
@@ -1,15 +1,20 @@
 """Tests for printer cache functionality."""
 
 import json
+import os
 import time
+from unittest.mock import MagicMock
 
 import pytest
 
 from p31s.cache import (
     CachedPrinter,
     clear_cache,
+    clear_scan_cache,
     load_cached_printer,
+    load_scan_results,
     save_printer,
+    save_scan_results,
 )
 
 
@@ -40,6 +45,55 @@ class TestCacheModule:
         assert self.config_dir.exists()
         assert self.cache_file.exists()
 
+    def test_save_leaves_no_temporary_file(self):
+        """Test save_printer replaces the cache file atomically."""
+        save_printer("AA:BB:CC:DD:EE:FF", "Test Printer")
+        save_printer("11:22:33:44:55:66", "Other Printer")
+
+        assert [p.name for p in self.config_dir.iterdir()] == ["last_printer"]
+        assert json.loads(self.cache_file.read_text())["address"] == "11:22:33:44:55:66"
+
+    def test_failed_save_removes_temporary_file(self, monkeypatch):
+        """Test a save that can't be renamed into place leaves no temp file behind."""
+
+        def fail_replace(src, dst):
+            raise OSError("read-only")
+
+        monkeypatch.setattr("p31s.cache.os.replace", fail_replace)
+        with pytest.raises(OSError):
+            save_printer("AA:BB:CC:DD:EE:FF", "Test Printer")
+
+        assert list(self.config_dir.iterdir()) == []
+
+    def test_failed_write_removes_temporary_file(self, monkeypatch):
+        """Test a write error (e.g. a full disk) leaves no temp file behind."""
+        import tempfile
+
+        real_tmp = tempfile.NamedTemporaryFile
+
+        def full_disk(*args, **kwargs):
+            tmp = real_tmp(*args, **kwargs)
+            tmp.write = MagicMock(side_effect=OSError("No space left on device"))
+            return tmp
+
+        monkeypatch.setattr("p31s.cache.tempfile.NamedTemporaryFile", full_disk)
+        with pytest.raises(OSError):
+            save_printer("AA:BB:CC:DD:EE:FF", "Test Printer")
+
+        assert list(self.config_dir.iterdir()) == []
+
+    def test_unserializable_data_creates_no_file(self):
+        """Test a value JSON can't encode fails before any file is created."""
+        with pytest.raises(TypeError):
+            save_scan_results([{"name": object()}], timeout=10.0)
+
+        assert list(self.config_dir.iterdir()) == []
+
+    def test_cache_file_is_indented(self):
+        """Test the cache file stays human-readable."""
+        save_printer("AA:BB:CC:DD:EE:FF", "Test Printer")
+        assert self.cache_file.read_text().startswith('{\n  "address"')
+
     def test_save_and_load_roundtrip(self):
         """Test saving and loading printer data."""
         address = "AA:BB:CC:DD:EE:FF"
@@ -88,6 +142,15 @@ class TestCacheModule:
         result = load_cached_printer(ttl_seconds=3600)
         assert result is None
 
+    def test_load_returns_none_for_stale_file(self):
+        """Test a cache file not written within the TTL is ignored."""
+        save_printer("AA:BB:CC:DD:EE:FF", "Test Printer")
+        old_time = time.time() - 2 * 60 * 60
+        os.utime(self.cache_file, (old_time, old_time))
+
+        assert load_cached_printer() is not None
+        assert load_cached_printer(ttl_seconds=3600) is None
+
     def test_load_returns_none_for_invalid_json(self):
         """Test load_cached_printer returns None for invalid JSON."""
         self.config_dir.mkdir(parents=True, exist_ok=True)
@@ -139,3 +202,77 @@ class TestCacheModule:
         assert cached.address == "AA:BB:CC:DD:EE:FF"
         assert cached.name == "Test Printer"
         assert cached.last_used == 1234567890.0
+
+
+class TestScanCache:
+    """Test caching of scan results."""
+
+    PRINTERS = [
+        {"name": "P31S-1", "address": "AA:BB:CC:DD:EE:FF", "rssi": -50, "mac_address": None},
+        {"name": "P31S-2", "address": "11:22:33:44:55:66", "rssi": -70, "mac_address": None},
+    ]
+
+    @pytest.fixture(autouse=True)
+    def setup_cache_dir(self, tmp_path, monkeypatch):
+        """Set up temporary cache directory for each test."""
+        test_config_dir = tmp_path / ".config" / "p31s"
+        test_scan_file = test_config_dir / "last_scan"
+
+        monkeypatch.setattr("p31s.cache.CONFIG_DIR", test_config_dir)
+        monkeypatch.setattr("p31s.cache.SCAN_CACHE_FILE", test_scan_file)
+
+        self.scan_file = test_scan_file
+
+    def test_load_returns_none_when_no_cache(self):
+        """Test load_scan_results returns None when nothing was saved."""
+        assert load_scan_results(timeout=10.0) is None
+
+    def test_save_and_load_roundtrip(self):
+        """Test saved scan results load back in order."""
+        save_scan_results(self.PRINTERS, timeout=10.0)
+        assert load_scan_results(timeout=10.0) == self.PRINTERS
+
+    def test_shorter_cached_scan_not_reused(self):
+        """Test results of a shorter scan don't stand in for a longer one."""
+        save_scan_results(self.PRINTERS, timeout=5.0)
+        assert load_scan_results(timeout=3.0) == self.PRINTERS
+        assert load_scan_results(timeout=10.0) is None
+
+    def test_load_returns_none_for_expired_results(self):
+        """Test scan results older than the TTL are ignored."""
+        save_scan_results(self.PRINTERS, timeout=10.0)
+        old_time = time.time() - 120
+        os.utime(self.scan_file, (old_time, old_time))
+
+        assert load_scan_results(timeout=10.0) is None
+        assert load_scan_results(timeout=10.0, ttl_seconds=300) == self.PRINTERS
+
+    def test_load_returns_none_for_invalid_json(self):
+        """Test load_scan_results returns None for invalid JSON."""
+        self.scan_file.parent.mkdir(parents=True, exist_ok=True)
+        self.scan_file.write_text("not valid json")
+        assert load_scan_results(timeout=10.0) is None
+
+    @pytest.mark.parametrize(
+        "printers",
+        [
+            {"name": "P31S"},  # not a list
+            ["P31S"],  # entry not a dict
+            [{"name": "P31S", "address": "AA:BB:CC:DD:EE:FF"}],  # missing rssi
+            [{"name": "P31S", "address": "AA:BB:CC:DD:EE:FF", "rssi": -50, "extra": 1}],
+            [{"name": "P31S", "address": "AA:BB:CC:DD:EE:FF", "rssi": "-50"}],  # wrong type
+        ],
+    )
+    def test_load_returns_none_for_malformed_entries(self, printers):
+        """Test entries that don't match PrinterInfo are treated as a cache miss."""
+        self.scan_file.parent.mkdir(parents=True, exist_ok=True)
+        data = {"scanned_at": time.time(), "timeout": 10.0, "printers": printers}
+        self.scan_file.write_text(json.dumps(data))
+        assert load_scan_results(timeout=10.0) is None
+
+    def test_clear_scan_cache(self):
+        """Test clear_scan_cache removes saved results."""
+        assert clear_scan_cache() is False
+        save_scan_results(self.PRINTERS, timeout=10.0)
+        assert clear_scan_cache() is True
+        assert load_scan_results(timeout=10.0) is None
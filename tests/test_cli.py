@@ -24,6 +24,11 @@ class TestBluetoothAddressValidation:
         result = validate_bluetooth_address(None, None, "AA:BB:CC:DD:EE:FF")
         assert result == "AA:BB:CC:DD:EE:FF"
 
+    def test_valid_macos_uuid_returns_uppercase(self):
+        """Test that a macOS CoreBluetooth UUID is accepted and uppercased."""
+        result = validate_bluetooth_address(None, None, "12345678-abcd-ef01-2345-6789abcdef01")
+        assert result == "12345678-ABCD-EF01-2345-6789ABCDEF01"
+
     def test_invalid_address_raises_bad_parameter(self):
         """Test that invalid address raises click.BadParameter."""
         import click
@@ -33,6 +38,24 @@ class TestBluetoothAddressValidation:
         assert "Invalid Bluetooth address" in str(exc_info.value)
         assert "XX:XX:XX:XX:XX:XX" in str(exc_info.value)
 
+    @pytest.mark.parametrize(
+        "address",
+        [
+            "AA-BB-CC-DD-EE-FF",  # wrong separator
+            "AA:BB:CC:DD:EE:GG",  # non-hex digit
+            "AA:BB:CC:DD:EE:FF:",  # too long
+            "  :BB:CC:DD:EE:FF",  # whitespace in place of hex digits
+            "12345678-ABCD-EF01-2345-6789ABCDEF0-",  # extra dash
+            "12345678:ABCD:EF01:2345:6789ABCDEF01",  # UUID with colons
+        ],
+    )
+    def test_malformed_address_rejected(self, address):
+        """Test that addresses with the right length but wrong shape are rejected."""
+        import click
+
+        with pytest.raises(click.BadParameter):
+            validate_bluetooth_address(None, None, address)
+
     def test_none_address_returns_none(self):
         """Test that None address returns None (allows optional address)."""
         result = validate_bluetooth_address(None, None, None)
@@ -505,6 +528,93 @@ class TestPrinterCaching:
         assert cached.address == "AA:BB:CC:DD:EE:FF"
         assert cached.name == "POLONO P31S"
 
+    def test_recent_scan_results_skip_scanning(self, runner, monkeypatch, tmp_path):
+        """Test a recent scan is reused when no printer is cached."""
+        from PIL import Image
+
+        import p31s.cli
+        from p31s.cache import save_scan_results
+
+        img_file = tmp_path / "test.png"
+        img = Image.new("RGB", (10, 10), color="white")
+        img.save(img_file)
+
+        save_scan_results(
+            [{"name": "Scanned P31S", "address": "AA:BB:CC:DD:EE:FF", "rssi": -50}],
+            timeout=10.0,
+        )
+
+        scan_called = []
+        connected = []
+
+        async def mock_scan(timeout=10.0):
+            scan_called.append(True)
+            return []
+
+        async def mock_connect(self, address, *args, **kwargs):
+            connected.append(address)
+            return True
+
+        async def mock_print(self, *args, **kwargs):
+            return True
+
+        async def mock_disconnect(self):
+            pass
+
+        monkeypatch.setattr(p31s.cli.P31SPrinter, "scan", mock_scan)
+        monkeypatch.setattr(p31s.cli.P31SPrinter, "connect", mock_connect)
+        monkeypatch.setattr(p31s.cli.P31SPrinter, "print_image", mock_print)
+        monkeypatch.setattr(p31s.cli.P31SPrinter, "disconnect", mock_disconnect)
+
+        result = runner.invoke(main, ["print", str(img_file)])
+        assert result.exit_code == 0
+        assert "Using printers from a recent scan" in result.output
+        assert "Found 1 printer: Scanned P31S" in result.output
+        assert len(scan_called) == 0
+        assert connected == ["AA:BB:CC:DD:EE:FF"]
+
+    def test_rescan_ignores_recent_scan_results(self, runner, monkeypatch, tmp_path):
+        """Test --rescan scans again even with recent scan results."""
+        from PIL import Image
+
+        import p31s.cli
+        from p31s.cache import load_scan_results, save_scan_results
+        from p31s.connection import PrinterInfo
+
+        img_file = tmp_path / "test.png"
+        img = Image.new("RGB", (10, 10), color="white")
+        img.save(img_file)
+
+        save_scan_results(
+            [{"name": "Old P31S", "address": "AA:BB:CC:DD:EE:FF", "rssi": -50}],
+            timeout=10.0,
+        )
+
+        async def mock_scan(timeout=10.0):
+            return [PrinterInfo(name="New P31S", address="11:22:33:44:55:66", rssi=-40)]
+
+        async def mock_connect(self, *args, **kwargs):
+            return True
+
+        async def mock_print(self, *args, **kwargs):
+            return True
+
+        async def mock_disconnect(self):
+            pass
+
+        monkeypatch.setattr(p31s.cli.P31SPrinter, "scan", mock_scan)
+        monkeypatch.setattr(p31s.cli.P31SPrinter, "connect", mock_connect)
+        monkeypatch.setattr(p31s.cli.P31SPrinter, "print_image", mock_print)
+        monkeypatch.setattr(p31s.cli.P31SPrinter, "disconnect", mock_disconnect)
+
+        result = runner.invoke(main, ["print", str(img_file), "--rescan"])
+        assert result.exit_code == 0
+        assert "Scanning for printers" in result.output
+        assert "Found 1 printer: New P31S" in result.output
+
+        # The fresh scan replaces the saved results
+        assert load_scan_results(timeout=10.0)[0]["name"] == "New P31S"
+
 
 class TestForgetCommand:
     """Test the forget command for clearing cached printer."""
@@ -550,6 +660,18 @@ class TestForgetCommand:
         assert result.exit_code == 0
         assert "No cached printer to forget." in result.output
 
+    def test_forget_clears_recent_scan_results(self, runner):
+        """Test forget also drops recent scan results so the next command scans."""
+        from p31s.cache import load_scan_results, save_scan_results
+
+        save_scan_results(
+            [{"name": "P31S", "address": "AA:BB:CC:DD:EE:FF", "rssi": -50}], timeout=10.0
+        )
+
+        result = runner.invoke(main, ["forget"])
+        assert result.exit_code == 0
+        assert load_scan_results(timeout=10.0) is None
+
 
 class TestMacAddressHelpers:
     """Test MAC address helper functions."""
@@ -1195,3 +1317,39 @@ class TestStatusCommand:
         assert "Found 1 printer" in result.output
         assert "Configuration:" in result.output
         assert "Battery:" in result.output
+
+
+class TestChunkDelayOption:
+    """Test the --chunk-delay group option."""
+
+    @pytest.mark.parametrize("args, expected", [([], 10.0), (["--chunk-delay", "0"], 0.0)])
+    def test_chunk_delay_reaches_printer(self, args, expected, monkeypatch, tmp_path):
+        """Test the print job pacing follows --chunk-delay (10 ms unless set)."""
+        from PIL import Image
+
+        import p31s.cli
+
+        img_file = tmp_path / "test.png"
+        Image.new("RGB", (10, 10), color="white").save(img_file)
+
+        delays = []
+
+        async def mock_connect(self, *args, **kwargs):
+            return True
+
+        async def mock_print(self, *args, **kwargs):
+            delays.append(self.chunk_delay_ms)
+            return True
+
+        async def mock_disconnect(self):
+            pass
+
+        monkeypatch.setattr(p31s.cli.P31SPrinter, "connect", mock_connect)
+        monkeypatch.setattr(p31s.cli.P31SPrinter, "print_image", mock_print)
+        monkeypatch.setattr(p31s.cli.P31SPrinter, "disconnect", mock_disconnect)
+
+        result = CliRunner().invoke(
+            main, [*args, "print", str(img_file), "--address", "AA:BB:CC:DD:EE:FF"]
+        )
+        assert result.exit_code == 0, result.output
+        assert delays == [expected]
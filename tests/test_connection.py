@@ -1,6 +1,7 @@
 """Tests for BLE connection handling."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -29,7 +30,7 @@ class TestNotificationSizeLimits:
         conn._handle_notification(mock_sender, oversized_data)
 
         # Queue should be empty - oversized data was rejected
-        assert conn._response_queue.qsize() == 0
+        assert len(conn._responses) == 0
 
     @pytest.mark.asyncio
     async def test_accepts_max_size_response(self):
@@ -42,7 +43,7 @@ class TestNotificationSizeLimits:
         conn._handle_notification(mock_sender, max_data)
 
         # Data should be queued
-        assert conn._response_queue.qsize() == 1
+        assert len(conn._responses) == 1
 
     @pytest.mark.asyncio
     async def test_accepts_small_response(self):
@@ -53,7 +54,7 @@ class TestNotificationSizeLimits:
         small_data = bytearray(b"OK")
         conn._handle_notification(mock_sender, small_data)
 
-        assert conn._response_queue.qsize() == 1
+        assert len(conn._responses) == 1
 
     @pytest.mark.asyncio
     async def test_queue_drops_oldest_when_full(self):
@@ -67,19 +68,53 @@ class TestNotificationSizeLimits:
             conn._handle_notification(mock_sender, data)
 
         # Queue should be full
-        assert conn._response_queue.qsize() == BLEConnection.MAX_QUEUE_SIZE
+        assert len(conn._responses) == BLEConnection.MAX_QUEUE_SIZE
 
         # Add one more item
         conn._handle_notification(mock_sender, bytearray([0xAA]))
 
         # Queue size should remain at MAX_QUEUE_SIZE
-        assert conn._response_queue.qsize() == BLEConnection.MAX_QUEUE_SIZE
+        assert len(conn._responses) == BLEConnection.MAX_QUEUE_SIZE
 
         # First item (oldest) should have been dropped
         # The new first item should be index 1 (index 0 was dropped)
-        first = conn._response_queue.get_nowait()
+        first = conn._responses.popleft()
         assert first == bytes([1])
 
+    @pytest.mark.asyncio
+    async def test_read_response_returns_in_order(self):
+        """read_response should return queued notifications oldest first."""
+        conn = BLEConnection()
+        mock_sender = MagicMock()
+
+        conn._handle_notification(mock_sender, bytearray(b"one"))
+        conn._handle_notification(mock_sender, bytearray(b"two"))
+
+        assert await conn.read_response(timeout=0.1) == b"one"
+        assert await conn.read_response(timeout=0.1) == b"two"
+        assert await conn.read_response(timeout=0.01) is None
+
+    @pytest.mark.asyncio
+    async def test_read_response_wakes_on_notification(self):
+        """read_response should wake up when a notification arrives."""
+        conn = BLEConnection()
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, conn._handle_notification, MagicMock(), bytearray(b"OK"))
+
+        assert await conn.read_response(timeout=1.0) == b"OK"
+
+    @pytest.mark.asyncio
+    async def test_read_response_concurrent_readers(self):
+        """Two waiting readers and one notification: one gets it, the other times out."""
+        conn = BLEConnection()
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, conn._handle_notification, MagicMock(), bytearray(b"A"))
+
+        results = await asyncio.gather(
+            conn.read_response(timeout=0.1), conn.read_response(timeout=0.1)
+        )
+        assert sorted(results, key=lambda r: r is None) == [b"A", None]
+
     @pytest.mark.asyncio
     async def test_notification_callback_still_called(self):
         """Notification callback should still be called for valid data."""
@@ -197,6 +232,54 @@ class TestRssiToBar:
         assert bar == "██████████"
 
 
+class TestScan:
+    """Tests for BLE scan filtering."""
+
+    @staticmethod
+    def _advertisement(address: str, name: str, rssi):
+        device = MagicMock(address=address)
+        device.name = name
+        adv_data = MagicMock(local_name=None, rssi=rssi, manufacturer_data={})
+        return address, (device, adv_data)
+
+    @pytest.mark.asyncio
+    async def test_filters_by_name_and_rssi(self):
+        """Only matching names at or above min_rssi are returned, strongest first."""
+        devices = dict(
+            [
+                self._advertisement("AA", "p31s_1234", -80),
+                self._advertisement("BB", "Headphones", -40),
+                self._advertisement("CC", "P31S_5678", -50),
+                self._advertisement("DD", "Niimbot D11", -95),
+            ]
+        )
+
+        with (
+            patch("p31s.connection.BleakScanner.discover", AsyncMock(return_value=devices)),
+            patch.object(BLEConnection, "_is_macos", return_value=False),
+        ):
+            all_printers = await BLEConnection.scan(timeout=0.1)
+            near_printers = await BLEConnection.scan(timeout=0.1, min_rssi=-90)
+
+        assert [p.address for p in all_printers] == ["CC", "AA", "DD"]
+        assert [p.address for p in near_printers] == ["CC", "AA"]
+
+    @pytest.mark.asyncio
+    async def test_missing_rssi_treated_as_weak(self):
+        """Devices without RSSI are reported at -100 dBm."""
+        devices = dict([self._advertisement("AA", "P31S", None)])
+
+        with (
+            patch("p31s.connection.BleakScanner.discover", AsyncMock(return_value=devices)),
+            patch.object(BLEConnection, "_is_macos", return_value=False),
+        ):
+            printers = await BLEConnection.scan(timeout=0.1)
+            filtered = await BLEConnection.scan(timeout=0.1, min_rssi=-90)
+
+        assert printers[0].rssi == -100
+        assert filtered == []
+
+
 class TestMacExtraction:
     """Tests for MAC address extraction from manufacturer data."""
 
@@ -265,3 +348,335 @@ class TestPlatformDetection:
         """_is_macos returns False on Windows."""
         with patch("p31s.connection.platform.system", return_value="Windows"):
             assert BLEConnection._is_macos() is False
+
+
+class TestWaitIdle:
+    """Tests for printer idle polling."""
+
+    @pytest.mark.asyncio
+    async def test_returns_true_when_idle(self):
+        """wait_idle returns True as soon as the printer reports idle."""
+        conn = BLEConnection()
+        conn.write = AsyncMock(return_value=True)
+        conn.read_response = AsyncMock(return_value=b"\x00")
+
+        assert await conn.wait_idle() is True
+        conn.write.assert_awaited_once_with(BLEConnection.STATUS_QUERY)
+
+    @pytest.mark.asyncio
+    async def test_polls_until_idle(self):
+        """wait_idle keeps polling while the printer reports busy."""
+        conn = BLEConnection()
+        conn.write = AsyncMock(return_value=True)
+        conn.read_response = AsyncMock(side_effect=[b"\x20", b"\x20", b"\x00"])
+
+        assert await conn.wait_idle(poll_interval=0) is True
+        assert conn.write.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_returns_false_without_response(self):
+        """wait_idle returns False when the status query goes unanswered."""
+        conn = BLEConnection()
+        conn.write = AsyncMock(return_value=True)
+        conn.read_response = AsyncMock(return_value=None)
+
+        assert await conn.wait_idle() is False
+
+    @pytest.mark.asyncio
+    async def test_returns_false_when_write_fails(self):
+        """wait_idle returns False when not connected."""
+        conn = BLEConnection()
+
+        assert await conn.wait_idle() is False
+
+    @pytest.mark.asyncio
+    async def test_discards_stale_responses(self):
+        """A reply queued before the poll is not taken for the status byte."""
+        conn = BLEConnection()
+        conn._handle_notification(None, bytearray(b"BATTERY \x75\x00\r\n"))
+
+        async def write(data):
+            conn._handle_notification(None, bytearray(b"\x00"))
+            return True
+
+        conn.write = AsyncMock(side_effect=write)
+
+        assert await conn.wait_idle() is True
+        assert not conn._responses
+
+    @pytest.mark.asyncio
+    async def test_skips_non_status_replies(self):
+        """Replies that are not a single status byte are ignored."""
+        conn = BLEConnection()
+        conn.write = AsyncMock(return_value=True)
+        conn.read_response = AsyncMock(side_effect=[b"CONFIG \x00\xcb", b"\x00\r\n"])
+
+        assert await conn.wait_idle() is True
+        conn.write.assert_awaited_once_with(BLEConnection.STATUS_QUERY)
+
+
+class TestConnectCached:
+    """Tests for connecting via the cached printer address."""
+
+    @pytest.mark.asyncio
+    async def test_uses_cached_address_without_scanning(self):
+        """A reachable cached printer is connected to without a scan."""
+        cached = MagicMock(address="AA:BB:CC:DD:EE:FF")
+        with (
+            patch("p31s.connection.load_cached_printer", return_value=cached),
+            patch.object(BLEConnection, "connect", AsyncMock(return_value=True)) as connect,
+            patch.object(BLEConnection, "scan", AsyncMock()) as scan,
+        ):
+            conn = await BLEConnection.connect_cached()
+
+        assert isinstance(conn, BLEConnection)
+        connect.assert_awaited_once_with("AA:BB:CC:DD:EE:FF")
+        scan.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_scans_and_saves_when_cached_connect_fails(self):
+        """A stale cache falls back to scanning and caches the new printer."""
+        cached = MagicMock(address="AA:BB:CC:DD:EE:FF")
+        found = PrinterInfo(name="P31S-1234", address="11:22:33:44:55:66", rssi=-50)
+        with (
+            patch("p31s.connection.load_cached_printer", return_value=cached),
+            patch.object(BLEConnection, "connect", AsyncMock(side_effect=[False, True])),
+            patch.object(BLEConnection, "disconnect", AsyncMock()) as disconnect,
+            patch.object(BLEConnection, "scan", AsyncMock(return_value=[found])),
+            patch("p31s.connection.save_printer") as save,
+        ):
+            conn = await BLEConnection.connect_cached()
+
+        assert isinstance(conn, BLEConnection)
+        save.assert_called_once_with("11:22:33:44:55:66", "P31S-1234")
+        # The half-open first attempt is closed before the scan attempt
+        disconnect.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_returns_none_when_no_printer_found(self):
+        """connect_cached returns None when nothing is cached or found."""
+        with (
+            patch("p31s.connection.load_cached_printer", return_value=None),
+            patch.object(BLEConnection, "scan", AsyncMock(return_value=[])),
+            patch("p31s.connection.save_printer") as save,
+        ):
+            assert await BLEConnection.connect_cached() is None
+
+        save.assert_not_called()
+
+
+class TestDiscoverCharacteristics:
+    """Tests for write/notify characteristic discovery."""
+
+    @staticmethod
+    def _char(uuid, *properties):
+        """A mock characteristic with a UUID and properties."""
+        return MagicMock(uuid=uuid, properties=list(properties))
+
+    @staticmethod
+    def _connection(*services):
+        """A BLEConnection whose client exposes the given characteristic lists."""
+        conn = BLEConnection()
+        conn.client = MagicMock(services=[MagicMock(characteristics=chars) for chars in services])
+        return conn
+
+    @pytest.mark.asyncio
+    async def test_stores_characteristic_objects(self):
+        """Discovered characteristics are kept as objects, not UUID strings."""
+        write_char = self._char("0000aaa1-0000-1000-8000-00805f9b34fb", "write-without-response")
+        notify_char = self._char("0000aaa2-0000-1000-8000-00805f9b34fb", "notify")
+        conn = self._connection([write_char, notify_char])
+
+        await conn._discover_characteristics()
+
+        assert conn.write_char is write_char
+        assert conn.notify_char is notify_char
+
+    @pytest.mark.asyncio
+    async def test_known_uuids_preferred(self):
+        """Known P31S characteristics win over earlier generic ones."""
+        generic = self._char("0000aaa1-0000-1000-8000-00805f9b34fb", "write", "notify")
+        write_char = self._char(BLEConnection.CHAR_WRITE, "write")
+        notify_char = self._char(BLEConnection.CHAR_NOTIFY, "notify")
+        conn = self._connection([generic], [write_char, notify_char])
+
+        await conn._discover_characteristics()
+
+        assert conn.write_char is write_char
+        assert conn.notify_char is notify_char
+
+    @pytest.mark.asyncio
+    async def test_alternative_uuids(self):
+        """The alternative vendor characteristics are recognized too."""
+        write_char = self._char(BLEConnection.ALT_CHAR_WRITE, "write-without-response")
+        notify_char = self._char(BLEConnection.ALT_CHAR_NOTIFY, "notify")
+        conn = self._connection([write_char, notify_char])
+
+        await conn._discover_characteristics()
+
+        assert conn.write_char is write_char
+        assert conn.notify_char is notify_char
+
+    @pytest.mark.asyncio
+    async def test_duplicate_uuid_takes_first(self):
+        """A UUID exposed by several services resolves to the first one."""
+        write_char = self._char(BLEConnection.CHAR_WRITE, "write")
+        notify_char = self._char(BLEConnection.CHAR_NOTIFY, "notify")
+        duplicate = self._char(BLEConnection.CHAR_WRITE, "write")
+        conn = self._connection([write_char, notify_char], [duplicate])
+
+        await conn._discover_characteristics()
+
+        assert conn.write_char is write_char
+        assert conn.notify_char is notify_char
+
+
+class TestConnect:
+    """Tests for connection setup."""
+
+    @pytest.mark.asyncio
+    async def test_reconnect_resets_state(self):
+        """State from a previous client doesn't survive a new connect()."""
+        conn = BLEConnection()
+        conn.write_char = MagicMock()
+        conn.notify_char = MagicMock()
+        conn._handle_notification(MagicMock(), bytearray(b"stale"))
+
+        client = MagicMock()
+        client.connect = AsyncMock(side_effect=OSError("unreachable"))
+        with patch("p31s.connection.BleakClient", return_value=client):
+            assert await conn.connect("AA:BB:CC:DD:EE:FF") is False
+
+        assert conn.write_char is None
+        assert conn.notify_char is None
+        assert await conn.read_response(timeout=0.01) is None
+
+
+class TestAcquireMtu:
+    """Tests for MTU acquisition after connecting."""
+
+    @pytest.mark.asyncio
+    async def test_acquires_on_bluez(self):
+        """The BlueZ backend is asked for the negotiated MTU."""
+        backend_cls = type("BleakClientBlueZDBus", (), {"_acquire_mtu": AsyncMock()})
+        backend = backend_cls()
+
+        conn = BLEConnection()
+        conn.client = MagicMock(_backend=backend)
+        await conn._acquire_mtu()
+
+        backend._acquire_mtu.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_skips_other_backends(self):
+        """Backends that report the MTU themselves are left alone."""
+        backend = MagicMock()
+        backend._acquire_mtu = AsyncMock()
+
+        conn = BLEConnection()
+        conn.client = MagicMock(_backend=backend)
+        await conn._acquire_mtu()
+
+        backend._acquire_mtu.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failure_is_ignored(self):
+        """A failed MTU acquisition doesn't fail the connection."""
+        backend_cls = type(
+            "BleakClientBlueZDBus", (), {"_acquire_mtu": AsyncMock(side_effect=OSError)}
+        )
+
+        conn = BLEConnection()
+        conn.client = MagicMock(_backend=backend_cls())
+        await conn._acquire_mtu()
+
+
+class TestWriteChunked:
+    """Tests for chunked writes."""
+
+    @pytest.fixture
+    def conn(self):
+        """Connection with a mocked client and write characteristic."""
+        conn = BLEConnection()
+        conn.client = MagicMock()
+        conn.client.write_gatt_char = AsyncMock()
+        conn.write_char = "char"
+        return conn
+
+    @pytest.mark.asyncio
+    async def test_paced_writes_in_order(self, conn):
+        """Chunks are written in order with the default delay."""
+        assert await conn.write_chunked(b"abcdefg", chunk_size=3, delay_ms=0.01) is True
+
+        chunks = [c.args[1] for c in conn.client.write_gatt_char.await_args_list]
+        assert chunks == [b"abc", b"def", b"g"]
+
+    @pytest.mark.asyncio
+    async def test_pipelined_writes_in_order(self, conn):
+        """Without delay or response, chunks are pipelined but stay in order."""
+        data = bytes(range(250))
+        assert await conn.write_chunked(data, chunk_size=10, delay_ms=0) is True
+
+        chunks = [c.args[1] for c in conn.client.write_gatt_char.await_args_list]
+        assert b"".join(chunks) == data
+        assert all(
+            c.kwargs["response"] is False for c in conn.client.write_gatt_char.await_args_list
+        )
+
+    @pytest.mark.asyncio
+    async def test_memoryview_chunks_are_bytes(self, conn):
+        """A memoryview job is sliced per chunk and sent as bytes."""
+        buffer = bytearray(b"abcdefg")
+        assert await conn.write_chunked(memoryview(buffer), chunk_size=3, delay_ms=0) is True
+
+        chunks = [c.args[1] for c in conn.client.write_gatt_char.await_args_list]
+        assert chunks == [b"abc", b"def", b"g"]
+        assert all(type(chunk) is bytes for chunk in chunks)
+
+    @pytest.mark.asyncio
+    async def test_pipelined_writes_bounded_in_flight(self, conn):
+        """No more than tx_queue_depth writes are outstanding at once."""
+        conn.tx_queue_depth = 4
+        in_flight = 0
+        peak = 0
+
+        async def slow_write(char, chunk, response):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+
+        conn.client.write_gatt_char = AsyncMock(side_effect=slow_write)
+        assert await conn.write_chunked(bytes(100), chunk_size=5, delay_ms=0) is True
+        assert peak == 4
+
+    @pytest.mark.asyncio
+    async def test_pipelined_write_failure_returns_false(self, conn):
+        """A failed pipelined write reports failure."""
+        conn.client.write_gatt_char = AsyncMock(side_effect=[None, OSError("gone")] + [None] * 8)
+        assert await conn.write_chunked(bytes(100), chunk_size=10, delay_ms=0) is False
+
+    @pytest.mark.asyncio
+    async def test_pipelined_write_failure_stops_and_cancels(self, conn):
+        """After a failed write no new chunks go out and pending writes are cancelled."""
+        conn.tx_queue_depth = 4
+        release = asyncio.Event()
+        started = []
+        cancelled = []
+
+        async def write(char, chunk, response):
+            index = len(started)
+            started.append(chunk)
+            if index == 0:
+                raise OSError("gone")
+            try:
+                await release.wait()
+            except asyncio.CancelledError:
+                cancelled.append(index)
+                raise
+
+        conn.client.write_gatt_char = AsyncMock(side_effect=write)
+        assert await conn.write_chunked(bytes(100), chunk_size=5, delay_ms=0) is False
+        assert len(started) == 4
+        assert sorted(cancelled) == [1, 2, 3]
@@ -64,6 +64,18 @@ class TestGenerateCoveragePattern:
         # Tick at y=20 on left edge
         assert img.getpixel((1, 20)) == 0  # Black
 
+    def test_has_grid_ticks_on_all_edges(self):
+        """Test that ticks are drawn on all four edges, 5px deep."""
+        img = generate_coverage_pattern(width=96, height=304, grid_spacing=20)
+        for x in range(20, 96, 20):
+            assert img.getpixel((x, 4)) == 0  # Top
+            assert img.getpixel((x, 299)) == 0  # Bottom
+            assert img.getpixel((x, 5)) == 1  # Ends after tick length
+        for y in range(20, 296, 20):  # Clear of the corner markers
+            assert img.getpixel((4, y)) == 0  # Left
+            assert img.getpixel((91, y)) == 0  # Right
+            assert img.getpixel((5, y)) == 1  # Ends after tick length
+
     def test_custom_grid_spacing(self):
         """Test grid spacing parameter."""
         img = generate_coverage_pattern(width=96, height=304, grid_spacing=40)
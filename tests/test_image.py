@@ -58,6 +58,16 @@ class TestImageProcessor:
         assert data[0] == 0xFF
         assert data[1] == 0xF0
 
+    def test_to_bytes_partial_byte_padding_every_row(self):
+        """Test padding bits stay zero on every row of a white image."""
+        processor = ImageProcessor(width=12)
+
+        # 12x3 all white: padding must not be inverted to black
+        img = Image.new("1", (12, 3), color=1)
+
+        assert processor.to_bytes(img) == bytes(6)
+        assert list(processor.iter_rows(img)) == [bytes(2)] * 3
+
     def test_iter_rows(self):
         """Test row iteration."""
         processor = ImageProcessor(width=8)
@@ -234,6 +234,21 @@ class TestPrintImageErrorHandling:
         result = await printer.print_image(img)
         assert result is True
 
+    @pytest.mark.asyncio
+    async def test_paces_chunks_by_default(self, mock_connection):
+        """Test that print jobs keep the 10 ms chunk pacing unless configured."""
+        printer = P31SPrinter()
+        printer.connection = mock_connection
+
+        img = Image.new("1", (10, 10), color=1)
+        await printer.print_image(img)
+        assert mock_connection.write_chunked.call_args.kwargs["delay_ms"] == 10.0
+
+        printer = P31SPrinter(chunk_delay_ms=0)
+        printer.connection = mock_connection
+        await printer.print_image(img)
+        assert mock_connection.write_chunked.call_args.kwargs["delay_ms"] == 0
+
     @pytest.mark.asyncio
     async def test_retry_on_failure(self, mock_connection):
         """Test retry logic on transient failure."""
@@ -283,6 +298,25 @@ class TestPrintImageErrorHandling:
             await printer.print_image(img, retries=2, retry_delay=0.01)
 
 
+class TestPrintTestPattern:
+    """Test the built-in checkerboard test pattern."""
+
+    @pytest.mark.asyncio
+    async def test_prints_8px_checkerboard(self):
+        """Test pattern is a 64x64 checkerboard of 8px cells, black top-left."""
+        printer = P31SPrinter()
+        printer.print_image = AsyncMock(return_value=True)
+
+        assert await printer.print_test_pattern() is True
+
+        img = printer.print_image.call_args[0][0]
+        assert img.size == (64, 64)
+        for y in range(64):
+            for x in range(64):
+                expected = 0 if (x // 8 + y // 8) % 2 == 0 else 255
+                assert img.getpixel((x, y)) == expected
+
+
 class TestConnectRetry:
     """Test connection retry logic."""
 
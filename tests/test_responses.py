@@ -0,0 +1,28 @@
+"""Tests for status response parsing."""
+
+import pytest
+
+from p31s.responses import ChunkSize, PrintedCount
+
+
+class TestNumericResponses:
+    """Test GETCHUNKSIZE and GETPRINTEDCOUNT parsing."""
+
+    @pytest.mark.parametrize("parser, field", [(ChunkSize, "size"), (PrintedCount, "count")])
+    def test_parses_number(self, parser, field):
+        """Test a prefixed number is parsed, with CRLF excluded from raw_data."""
+        result = parser.parse(b"SIZE 512\r\n")
+        assert result is not None
+        assert getattr(result, field) == 512
+        assert result.raw_data == b"SIZE 512"
+
+    @pytest.mark.parametrize("parser", [ChunkSize, PrintedCount])
+    def test_rejects_non_ascii(self, parser):
+        """Test garbled non-ASCII replies are rejected, not read as a number."""
+        assert parser.parse(b"\xff12") is None
+        assert parser.parse(b"12\x80\r\n") is None
+
+    @pytest.mark.parametrize("parser", [ChunkSize, PrintedCount])
+    def test_rejects_missing_number(self, parser):
+        """Test a reply without digits is rejected."""
+        assert parser.parse(b"ERROR\r\n") is None
@@ -80,6 +80,17 @@ class TestTSPLCommand:
         expected = b"SIZE 15.0 mm,10.0 mm\r\nGAP 2.0 mm,0 mm\r\nCLS\r\nPRINT 1,1\r\n"
         assert cmd.get_commands() == expected
 
+    def test_get_view(self):
+        """Test zero-copy view of the queued commands."""
+        cmd = TSPLCommand()
+        cmd.cls()
+        cmd.print_label(1)
+
+        view = cmd.get_view()
+        assert isinstance(view, memoryview)
+        assert view == cmd.get_commands()
+        view.release()
+
     def test_clear(self):
         """Test clearing commands."""
         cmd = TSPLCommand()
@@ -150,6 +161,16 @@ class TestConvenienceMethods:
         assert b"DENSITY 10" in result
         assert b"CLS" in result
 
+    def test_setup_label_keeps_number_formatting(self):
+        """Test cached setup_label output matches the label's own values."""
+        int_cmd = TSPLCommand()
+        int_cmd.setup_label(LabelSize(width=14, height=40, gap=2))
+        float_cmd = TSPLCommand()
+        float_cmd.setup_label(LabelSize(width=14.0, height=40.0, gap=2.0))
+
+        assert int_cmd.get_commands().startswith(b"SIZE 14 mm,40 mm\r\nGAP 2 mm")
+        assert float_cmd.get_commands().startswith(b"SIZE 14.0 mm,40.0 mm\r\nGAP 2.0 mm")
+
     def test_create_print_job(self):
         """Test create_print_job function."""
         label = LabelSize(width=15.0, height=10.0)